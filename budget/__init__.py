@@ -1,16 +1,33 @@
 """
 Budget application package initialization.
+
+Configuration lives in the top-level ``configs`` package; import it from
+there directly (e.g. ``from configs.config import AI_API``).
 """
-# Import configuration modules
-from configs import (
-    config, 
-    ai_config, 
-    categories_config, 
-    default_config, 
-    import_config, 
-    logging_config, 
-    visual_config
-)
+import importlib
 
 __version__ = '0.1.0'
-__author__ = 'Matthew Zujewski'
\ No newline at end of file
+__author__ = 'Matthew Zujewski'
+
+# Public classes are loaded on first access (PEP 562), so importing the
+# package does not pull in pandas, scikit-learn or the HTTP clients
+_LAZY = {
+    'Categorizer': 'budget.categorize',
+    'TransactionParser': 'budget.parser',
+    'AITools': 'budget.ai_tools'
+}
+
+__all__ = list(_LAZY)
+
+def __getattr__(name):
+    """Import a public class from its submodule on first access."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        
+    obj = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = obj
+    return obj
+
+def __dir__():
+    """List module attributes including the lazily loaded classes."""
+    return sorted(list(globals()) + __all__)
@@ -1,21 +1,52 @@
 """
 Main entry point for the budget application.
+
+Run from the project root with ``python -m budget``.
 """
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+import importlib.util
 import os
-import pandas as pd
 from pathlib import Path
+import re
 import sys
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from budget.parser import TransactionParser
-from budget.categorize import Categorizer
-from budget.visualizer import BudgetVisualizer
-from budget.ai_tools import AITools
+# Heavy dependencies (pandas, numpy and the budget submodules) are imported
+# inside the command handlers that need them, to keep CLI startup fast
 from budget.logger import logger
-from configs.config import *
+from configs.config import DATA_DIR, AI_API, BANK_IMPORT
+
+# Opt-in: unlockedpd patches pandas' rolling/expanding/EWM operations with
+# parallel implementations that give identical results
+if os.environ.get('BUDGET_FAST_PANDAS') == '1':
+    try:
+        import unlockedpd  # noqa: F401
+    except ImportError:
+        pass
+
+# Checked without importing pyarrow itself
+_has_pyarrow = importlib.util.find_spec('pyarrow') is not None
+
+# Use the multi-threaded pyarrow CSV reader when available
+ENGINE = 'pyarrow' if _has_pyarrow else 'c'
+
+# Explicit dtypes for known transaction columns, so the reader skips inference
+DTYPES = {
+    'amount': 'float64',
+    'category': 'category',
+    'source': 'category'
+}
+
+# Columns consumed by the analyze command
+ANALYSIS_COLUMNS = ['date', 'amount', 'category']
+
+# Low-cardinality string columns stored as categoricals after load
+CATEGORICAL_COLUMNS = ('category', 'source', 'account')
+
+# Matches the AI provider setting in the .env file
+_AI_PROV_RE = re.compile(r'^AI_PROVIDER=.*$', re.M)
 
 
 def main():
@@ -81,41 +112,164 @@ def main():
     else:
         parser.print_help()
 
+@lru_cache(maxsize=1)
+def _ai():
+    """
+    Get the shared AITools instance, creating it on first use.
+    
+    Returns:
+        AITools: AI tools for the configured provider
+    """
+    from budget.ai_tools import AITools
+    return AITools()
+
+def _read_transactions(file_path, columns=None, downcast_amounts=False):
+    """
+    Read transactions from a Parquet or CSV file.
+    
+    Parquet files are read directly; CSV files are parsed with explicit
+    dtypes and date parsing.
+    
+    Args:
+        file_path (str): Path to the Parquet or CSV file
+        columns (list, optional): Only read these columns (those missing from the file are ignored)
+        downcast_amounts (bool): Load amounts as float32; only for read-only analysis, never for data written back
+        
+    Returns:
+        pd.DataFrame: Loaded transactions
+    """
+    import pandas as pd
+    
+    if Path(file_path).suffix.lower() == '.parquet':
+        if not columns:
+            return _optimize_dtypes(pd.read_parquet(file_path), downcast_amounts)
+        
+        import pyarrow.parquet as pq
+        names = pq.read_schema(file_path).names
+        return _optimize_dtypes(pd.read_parquet(file_path, columns=[col for col in names if col in columns]),
+                                downcast_amounts)
+    
+    header = pd.read_csv(file_path, nrows=0).columns
+    usecols = [col for col in header if col in columns] if columns else None
+    present = usecols if usecols is not None else list(header)
+    
+    transactions = pd.read_csv(
+        file_path,
+        engine=ENGINE,
+        usecols=usecols,
+        dtype={col: dtype for col, dtype in DTYPES.items() if col in present},
+        parse_dates=['date'] if 'date' in present else False
+    )
+    
+    # parse_dates leaves the column as text when the dates are not ISO-like
+    if 'date' in transactions.columns and not pd.api.types.is_datetime64_any_dtype(transactions['date']):
+        transactions['date'] = _parse_dates(transactions['date'])
+    
+    return _optimize_dtypes(transactions, downcast_amounts)
+
+def _parse_dates(dates):
+    """
+    Parse a column of date strings with a format detected from its first value.
+    
+    Args:
+        dates (pd.Series): Date strings
+        
+    Returns:
+        pd.Series: Parsed dates (unparseable values become NaT)
+    """
+    import pandas as pd
+    
+    date_format = None
+    sample = dates.dropna()
+    if not sample.empty:
+        first = str(sample.iloc[0])
+        for candidate in BANK_IMPORT['date_formats']:
+            try:
+                datetime.strptime(first, candidate)
+                date_format = candidate
+                break
+            except ValueError:
+                continue
+    
+    return pd.to_datetime(dates, format=date_format, cache=True, errors='coerce')
+
+def _optimize_dtypes(transactions, downcast_amounts=False):
+    """
+    Convert low-cardinality string columns to categoricals and optionally downcast amounts.
+    
+    Args:
+        transactions (pd.DataFrame): Freshly loaded transactions
+        downcast_amounts (bool): Downcast amounts to float32, which loses cents on large values
+        
+    Returns:
+        pd.DataFrame: The same DataFrame with compact dtypes
+    """
+    import pandas as pd
+    
+    if downcast_amounts and 'amount' in transactions.columns:
+        transactions['amount'] = pd.to_numeric(transactions['amount'], downcast='float')
+    
+    for col in CATEGORICAL_COLUMNS:
+        if col in transactions.columns:
+            transactions[col] = transactions[col].astype('category')
+    
+    return transactions
+
+def _write_transactions(transactions, file_path):
+    """
+    Write transactions to Parquet or CSV depending on the file extension.
+    
+    Args:
+        transactions (pd.DataFrame): Transactions to write
+        file_path (str): Destination path (.parquet for Parquet, anything else for CSV)
+    """
+    if Path(file_path).suffix.lower() == '.parquet':
+        transactions.to_parquet(file_path, engine='pyarrow', compression='zstd', index=False)
+    else:
+        transactions.to_csv(file_path, index=False)
+
 def import_transactions(args):
     """Import transactions from a file."""
+    from budget.parser import TransactionParser
+    
     file_path = args.file
     source = args.source
     
     parser = TransactionParser()
     
     if parser.import_file(file_path, source):
-        output_path = os.path.join(DATA_DIR, 'imported_transactions.csv')
+        output_path = os.path.join(DATA_DIR, 'imported_transactions.parquet')
         parser.export_transactions(output_path)
         
         summary = parser.summary()
-        print(f"Successfully imported {summary['count']} transactions")
-        print(f"Date range: {summary['date_range']['start']} to {summary['date_range']['end']}")
-        print(f"Total income: ${summary.get('total_income', 0):.2f}")
-        print(f"Total expenses: ${abs(summary.get('total_expenses', 0)):.2f}")
-        print(f"Net: ${summary.get('net', 0):.2f}")
-        print(f"Transactions saved to: {output_path}")
+        date_range = summary['date_range']
+        sys.stdout.write(
+            f"Successfully imported {summary['count']} transactions\n"
+            f"Date range: {date_range['start']} to {date_range['end']}\n"
+            f"Total income: ${summary.get('total_income', 0):.2f}\n"
+            f"Total expenses: ${abs(summary.get('total_expenses', 0)):.2f}\n"
+            f"Net: ${summary.get('net', 0):.2f}\n"
+            f"Transactions saved to: {output_path}\n"
+        )
     else:
         print(f"Failed to import transactions from {file_path}")
 
 def categorize_transactions(args):
     """Categorize transactions."""
+    from budget.categorize import Categorizer
+    
     # Load transactions
     if args.file:
         file_path = args.file
     else:
-        file_path = os.path.join(DATA_DIR, 'imported_transactions.csv')
+        file_path = os.path.join(DATA_DIR, 'imported_transactions.parquet')
     
     if not os.path.exists(file_path):
         print(f"File not found: {file_path}")
         return
     
     try:
-        transactions = pd.read_csv(file_path)
+        transactions = _read_transactions(file_path)
         print(f"Loaded {len(transactions)} transactions from {file_path}")
     except Exception as e:
         print(f"Error loading transactions: {str(e)}")
@@ -131,19 +285,19 @@ def categorize_transactions(args):
     if args.output:
         output_path = args.output
     else:
-        output_path = os.path.join(DATA_DIR, 'categorized_transactions.csv')
+        output_path = os.path.join(DATA_DIR, 'categorized_transactions.parquet')
     
     try:
-        categorized.to_csv(output_path, index=False)
+        _write_transactions(categorized, output_path)
         print(f"Saved categorized transactions to {output_path}")
     except Exception as e:
         print(f"Error saving categorized transactions: {str(e)}")
     
     # Show category distribution
-    category_counts = categorized['category'].value_counts()
-    print("\nCategory distribution:")
-    for category, count in category_counts.items():
-        print(f"  {category}: {count} transactions")
+    category_counts = categorized.groupby('category', sort=False, observed=True).size().sort_values(ascending=False)
+    sys.stdout.write("\nCategory distribution:\n" + "".join(
+        f"  {category}: {count} transactions\n" for category, count in category_counts.items()
+    ))
     
     # Train model if requested
     if args.train:
@@ -155,41 +309,47 @@ def categorize_transactions(args):
 
 def analyze_transactions(args):
     """Analyze categorized transactions."""
+    import numpy as np
+    import pandas as pd
+    
     # Load categorized transactions
     if args.file:
         file_path = args.file
     else:
-        file_path = os.path.join(DATA_DIR, 'categorized_transactions.csv')
+        file_path = os.path.join(DATA_DIR, 'categorized_transactions.parquet')
     
     if not os.path.exists(file_path):
         print(f"File not found: {file_path}")
         return
     
     try:
-        transactions = pd.read_csv(file_path)
+        transactions = _read_transactions(file_path, columns=ANALYSIS_COLUMNS, downcast_amounts=True)
         print(f"Loaded {len(transactions)} transactions from {file_path}")
     except Exception as e:
         print(f"Error loading transactions: {str(e)}")
         return
     
-    # Convert date column to datetime
-    if 'date' in transactions.columns:
-        transactions['date'] = pd.to_datetime(transactions['date'])
-    
-    # Apply date filters
-    if args.start:
-        start_date = pd.to_datetime(args.start)
-        transactions = transactions[transactions['date'] >= start_date]
-    
-    if args.end:
-        end_date = pd.to_datetime(args.end)
-        transactions = transactions[transactions['date'] <= end_date]
+    # Apply date filters as a slice of the date-sorted transactions
+    if args.start or args.end:
+        if not transactions['date'].is_monotonic_increasing:
+            transactions = transactions.sort_values('date', kind='mergesort', ignore_index=True)
+        
+        dates = transactions['date'].to_numpy()
+        lo = np.searchsorted(dates, pd.to_datetime(args.start).to_datetime64()) if args.start else 0
+        hi = np.searchsorted(dates, pd.to_datetime(args.end).to_datetime64(), side='right') if args.end else len(dates)
+        
+        # Missing dates sort to the end and are never inside the range
+        hi = min(hi, len(dates) - int(transactions['date'].isna().sum()))
+        transactions = transactions.iloc[lo:hi]
     
     print(f"Analyzing {len(transactions)} transactions")
     
-    # Calculate basic statistics
-    total_income = transactions[transactions['amount'] > 0]['amount'].sum()
-    total_expenses = transactions[transactions['amount'] < 0]['amount'].sum()
+    # Calculate basic statistics from a single pass over the amounts
+    amt = transactions['amount'].to_numpy()
+    pos = amt > 0
+    neg = amt < 0
+    total_income = amt[pos].sum(dtype=np.float64)
+    total_expenses = amt[neg].sum(dtype=np.float64)
     net = total_income + total_expenses
     
     print(f"\nTotal income: ${total_income:.2f}")
@@ -197,22 +357,24 @@ def analyze_transactions(args):
     print(f"Net: ${net:.2f}")
     
     # Category breakdown
-    print("\nExpenses by category:")
-    category_expenses = transactions[transactions['amount'] < 0].groupby('category')['amount'].sum().sort_values()
-    for category, amount in category_expenses.items():
-        percentage = abs(amount) / abs(total_expenses) * 100
-        print(f"  {category}: ${abs(amount):.2f} ({percentage:.1f}%)")
+    expense_amounts = pd.Series(np.where(neg, amt, 0), index=transactions.index)
+    category_totals = expense_amounts.groupby(transactions['category'], sort=False, observed=True).sum()
+    category_expenses = category_totals[category_totals < 0].sort_values()
+    sys.stdout.write("\nExpenses by category:\n" + "".join(
+        f"  {category}: ${abs(amount):.2f} ({abs(amount) / abs(total_expenses) * 100:.1f}%)\n"
+        for category, amount in category_expenses.items()
+    ))
     
     # Monthly summary
+    monthly = None
     if 'date' in transactions.columns:
-        print("\nMonthly summary:")
-        transactions['month'] = transactions['date'].dt.to_period('M')
-        monthly = transactions.groupby('month').agg({'amount': 'sum'})
-        for month, row in monthly.iterrows():
-            print(f"  {month}: ${row['amount']:.2f}")
+        monthly = transactions['amount'].groupby(transactions['date'].dt.to_period('M'), sort=True).sum()
+        sys.stdout.write("\nMonthly summary:\n" + "".join(
+            f"  {month}: ${amount:.2f}\n" for month, amount in monthly.items()
+        ))
     
     # Generate insights using AI if available
-    ai_tools = AITools()
+    ai_tools = _ai()
     if ai_tools.is_enabled() and AI_API['capabilities']['spending_insights']:
         print("\nGenerating AI insights...")
         
@@ -221,7 +383,10 @@ def analyze_transactions(args):
             'total_income': float(total_income),
             'total_expenses': float(abs(total_expenses)),
             'net': float(net),
-            'expenses_by_category': {cat: float(abs(amt)) for cat, amt in category_expenses.items()},
+            'expenses_by_category': dict(zip(
+                category_expenses.index.tolist(),
+                np.abs(category_expenses.to_numpy()).tolist()
+            )),
             'transaction_count': len(transactions),
             'date_range': {
                 'start': transactions['date'].min().strftime('%Y-%m-%d') if 'date' in transactions.columns else None,
@@ -243,24 +408,35 @@ def analyze_transactions(args):
         output_dir = Path(args.output)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save summary to CSV
+        # Summary
         summary_data = {
             'metric': ['Total Income', 'Total Expenses', 'Net'],
             'amount': [total_income, abs(total_expenses), net]
         }
-        pd.DataFrame(summary_data).to_csv(output_dir / 'summary.csv', index=False)
+        outputs = [
+            (pd.DataFrame(summary_data), output_dir / 'summary.csv', {})
+        ]
         
-        # Save category breakdown to CSV
+        # Category breakdown
+        # Precision is applied once when writing rather than with rounded copies
+        expense_values = np.abs(category_expenses.to_numpy())
         category_df = pd.DataFrame({
             'category': category_expenses.index,
-            'amount': category_expenses.values.round(2).abs(),
-            'percentage': (category_expenses.values / total_expenses * 100).round(2).abs()
+            'amount': expense_values,
+            'percentage': expense_values * (100.0 / abs(total_expenses)) if total_expenses else expense_values
         })
-        category_df.to_csv(output_dir / 'category_breakdown.csv', index=False)
+        outputs.append((category_df, output_dir / 'category_breakdown.csv', {'float_format': '%.2f'}))
+        
+        # Monthly summary if available
+        if monthly is not None:
+            monthly_df = monthly.rename_axis('month').reset_index(name='amount')
+            outputs.append((monthly_df, output_dir / 'monthly_summary.csv', {}))
         
-        # Save monthly summary to CSV if available
-        if 'month' in transactions.columns:
-            monthly.reset_index().to_csv(output_dir / 'monthly_summary.csv', index=False)
+        # The files are independent, so write them concurrently
+        with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+            futures = [executor.submit(df.to_csv, path, index=False, **kwargs) for df, path, kwargs in outputs]
+            for future in futures:
+                future.result()
         
         print(f"Analysis results saved to {output_dir}")
 
@@ -273,7 +449,7 @@ def ai_assistant(args):
     """Interact with the AI financial assistant."""
     query = ' '.join(args.query)
     
-    ai_tools = AITools()
+    ai_tools = _ai()
     
     # Switch provider if specified
     if args.provider:
@@ -290,14 +466,21 @@ def ai_assistant(args):
     print(f"Query: {query}")
     print("\nThinking...")
     
-    response = ai_tools.financial_assistant(query)
+    response = ai_tools.financial_assistant(query, stream=True)
+    
+    # Error and configuration messages come back as a plain string
+    if isinstance(response, str):
+        response = [response]
     
     print("\nResponse:")
-    print(response)
+    for chunk in response:
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+    print()
 
 def configure_ai(args):
     """Configure AI settings."""
-    ai_tools = AITools()
+    ai_tools = _ai()
     
     # Show status if requested
     if args.status:
@@ -341,15 +524,17 @@ def configure_ai(args):
             # Update .env file
             env_path = Path('.env')
             if env_path.exists():
-                with open(env_path, 'r') as f:
-                    lines = f.readlines()
+                text = env_path.read_text()
+                setting = f'AI_PROVIDER={args.provider}'
+                
+                # Replace the existing setting, or append it if missing
+                updated, count = _AI_PROV_RE.subn(setting, text)
+                if count == 0:
+                    if text and not text.endswith('\n'):
+                        text += '\n'
+                    updated = f'{text}{setting}\n'
                 
-                with open(env_path, 'w') as f:
-                    for line in lines:
-                        if line.startswith('AI_PROVIDER='):
-                            f.write(f'AI_PROVIDER={args.provider}\n')
-                        else:
-                            f.write(line)
+                env_path.write_text(updated)
                 
                 print(f"Updated .env file with new provider: {args.provider}")
             else:
@@ -0,0 +1,66 @@
+"""
+Numba kernel for keyword rule matching over packed byte buffers.
+
+Only imported when numba is installed; see Categorizer._categorize_with_rules_batch.
+"""
+import numpy as np
+from numba import njit, prange
+
+@njit(parallel=True, cache=True)
+def match_rules(desc_buf, desc_off, kw_buf, kw_off, kw_cat, out):
+    """
+    Find the first matching category for each description.
+    
+    Keywords must be ordered by category index, so the first keyword found in a
+    description belongs to the earliest matching category.
+    
+    Args:
+        desc_buf (np.ndarray): uint8 buffer of all lowercased UTF-8 descriptions
+        desc_off (np.ndarray): int64 offsets into desc_buf, one more than the row count
+        kw_buf (np.ndarray): uint8 buffer of all lowercased UTF-8 keywords
+        kw_off (np.ndarray): int64 offsets into kw_buf, one more than the keyword count
+        kw_cat (np.ndarray): Category index of each keyword
+        out (np.ndarray): int16 output, set to the category index per row or -1
+    """
+    n_rows = desc_off.shape[0] - 1
+    n_keywords = kw_off.shape[0] - 1
+    
+    for i in prange(n_rows):
+        start = desc_off[i]
+        end = desc_off[i + 1]
+        out[i] = -1
+        
+        for k in range(n_keywords):
+            kw_start = kw_off[k]
+            kw_len = kw_off[k + 1] - kw_start
+            found = False
+            
+            for j in range(start, end - kw_len + 1):
+                found = True
+                for m in range(kw_len):
+                    if desc_buf[j + m] != kw_buf[kw_start + m]:
+                        found = False
+                        break
+                if found:
+                    break
+            
+            if found:
+                out[i] = kw_cat[k]
+                break
+
+def pack_strings(strings):
+    """
+    Pack strings into one UTF-8 byte buffer plus row offsets.
+    
+    Args:
+        strings (iterable): Strings to pack
+    
+    Returns:
+        tuple: (uint8 buffer, int64 offsets with one more entry than strings)
+    """
+    encoded = [text.encode('utf-8') for text in strings]
+    
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+    
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
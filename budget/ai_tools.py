@@ -1,14 +1,243 @@
 """
 AI integration tools for the budget application using Claude and OpenAI APIs.
 """
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import importlib.util
 import json
+import logging
+import numpy as np
+import re
 import requests
+from requests.adapters import HTTPAdapter
+import sqlite3
+import threading
 import time
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
+from urllib3.util.retry import Retry
 
 from configs.config import AI_API
 from .logger import logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Persona system prompt for free-form requests; kept byte-identical so providers can cache the prefix
+_SYSTEM_PROMPT = ("You are a helpful financial assistant that provides accurate and concise information "
+                  "about personal finance and budgeting.")
+
+# Fixed categorization instructions, sent as a cacheable system block rather than in each prompt
+_CATEGORY_TAXONOMY = """Categorize financial transactions into exactly one of these categories:
+- income (salary, deposits, refunds)
+- housing (mortgage, rent, property taxes)
+- utilities (electric, water, gas, internet, phone)
+- groceries (supermarkets, food stores)
+- dining (restaurants, cafes, food delivery)
+- transportation (gas, public transit, car services, parking)
+- healthcare (medical bills, pharmacy, insurance)
+- entertainment (movies, streaming services, events)
+- shopping (retail, online purchases, clothing)
+- personal (haircuts, gym, personal care)
+- education (tuition, books, courses)
+- travel (flights, hotels, vacation expenses)
+- savings (transfers to savings, investments)
+- debt (credit card payments, loan payments)
+- miscellaneous (anything that doesn't fit above)"""
+
+# Prompt templates, split around their dynamic fields at import time so each call only
+# formats the variable part and the static text stays byte-identical across requests
+_CATEGORIZE_BATCH_PREFIX = (
+    "Analyze these financial transactions and categorize each into one of the categories above.\n\n"
+    "Transactions:\n"
+)
+_CATEGORIZE_BATCH_SUFFIX = (
+    "\n\nRespond in JSON format with a 'results' array containing one object per transaction with "
+    "'index', 'category' and 'confidence' keys, where 'index' is the transaction number above.\n"
+    'Example: {"results": [{"index": 1, "category": "groceries", "confidence": 0.85}]}'
+)
+
+_CATEGORIZE_PREFIX = (
+    "Analyze this financial transaction and categorize it into one of the categories above.\n\n"
+    "Transaction details:\n"
+)
+_CATEGORIZE_SUFFIX = (
+    "\n\nRespond in JSON format with only 'category' and 'confidence' keys.\n"
+    'Example: {"category": "groceries", "confidence": 0.85}'
+)
+
+_INSIGHTS_PREFIX = (
+    "Analyze this financial transaction summary data and provide 3-5 key insights about spending patterns, "
+    "unusual expenses, potential savings opportunities, and financial trends.\n\n"
+    "Transaction Summary:\n"
+)
+_INSIGHTS_SUFFIX = (
+    "\n\nRespond in JSON format with an 'insights' array containing objects with 'title' and 'description' fields.\n"
+    'Example: {"insights": [{"title": "Dining expenses increased by 25%", "description": "Your spending on '
+    'restaurants and takeout has increased significantly compared to previous months."}]}'
+)
+
+_RECOMMENDATIONS_PREFIX = (
+    "Create personalized budget recommendations based on the following financial data.\n"
+    "Use the 50/30/20 rule (50% needs, 30% wants, 20% savings) as a general guideline.\n\n"
+)
+_RECOMMENDATIONS_SUFFIX = (
+    "\n\nRespond in JSON format with a 'recommendations' array containing objects with 'category', "
+    "'current_amount', 'recommended_amount', and 'explanation' fields.\n"
+    'Example: {"recommendations": [{"category": "dining", "current_amount": 350.00, "recommended_amount": 250.00, '
+    '"explanation": "Reducing dining out expenses by $100 would bring this category within the recommended range."}]}'
+)
+
+_ASSISTANT_PREFIX = (
+    "You are a helpful financial assistant. Answer the following question about budgeting, finances, or the user's "
+    "financial data provided in the context.\n\n"
+)
+_ASSISTANT_SUFFIX = (
+    "\n\nProvide a clear, concise, and helpful response. If you don't have enough information to answer accurately, "
+    "say so and suggest what additional information would be helpful."
+)
+
+# Output token caps per request type; a categorization answer is only a few dozen tokens
+_CATEGORIZE_MAX_TOKENS = 60
+_CATEGORIZE_BATCH_TOKENS_PER_ROW = 30
+_INSIGHTS_MAX_TOKENS = 1024
+_RECOMMENDATIONS_MAX_TOKENS = 600
+
+# Retry policy shared by the sync session and the async client
+_RETRY_TOTAL = 3
+_RETRY_BACKOFF = 0.3
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Errors the async provider calls log before re-raising; httpx's are only added when it is installed
+_ASYNC_HTTP_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx is not None else ())
+
+# Response bodies above this size are stream-parsed (when ijson is installed) instead of loaded whole
+_STREAM_PARSE_MIN_BYTES = 8 * 1024
+
+def _batch_prompt(transactions: List[Dict[str, Any]]) -> str:
+    """Build the categorization prompt for a numbered batch of transactions."""
+    lines = '\n'.join(
+        f"{i}. Description: {t['description']}, Amount: ${t['amount']:.2f}, Date: {t['date']}"
+        for i, t in enumerate(transactions, 1)
+    )
+    return ''.join((_CATEGORIZE_BATCH_PREFIX, lines, _CATEGORIZE_BATCH_SUFFIX))
+
+def _single_prompt(description: str, amount: float, date: str) -> str:
+    """Build the categorization prompt for one transaction."""
+    return ''.join((
+        _CATEGORIZE_PREFIX,
+        f"Description: {description}\nAmount: ${amount:.2f}\nDate: {date}",
+        _CATEGORIZE_SUFFIX
+    ))
+
+def _dumps(data: Any) -> str:
+    """
+    Serialize prompt data as compact JSON, using orjson when it is installed.
+    
+    Args:
+        data: JSON-serializable data (numpy scalars and arrays are accepted with orjson)
+        
+    Returns:
+        str: JSON text without indentation or extra whitespace
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, separators=(',', ':'), default=str)
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON text or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _raise_for_status(response: Union[requests.Response, 'httpx.Response']):
+    """
+    Raise requests.HTTPError for 4xx/5xx responses.
+    
+    A cheaper stand-in for Response.raise_for_status(), which always builds its error message.
+    Used for both requests and httpx responses so sync and async calls fail the same way.
+    
+    Args:
+        response (requests.Response or httpx.Response): API response
+    """
+    if response.status_code >= 400:
+        raise requests.HTTPError(f"{response.status_code}: {response.text[:200]}", response=response)
+
+# Merchant normalization: drop digits/punctuation (store numbers, card suffixes) and collapse whitespace;
+# letters in any script are kept
+_MERCHANT_STRIP_RE = re.compile(r'[\W\d_]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _normalize_merchant(description: str) -> str:
+    """
+    Normalize a transaction description to a stable merchant key.
+    
+    Args:
+        description (str): Transaction description (e.g. "STARBUCKS #1234 SEATTLE")
+        
+    Returns:
+        str: Normalized merchant (e.g. "starbucks seattle")
+    """
+    lowered = _MERCHANT_STRIP_RE.sub(' ', str(description).lower())
+    return _WHITESPACE_RE.sub(' ', lowered).strip()
+
+# A fenced ```json block, or everything from the first '{' to the last '}'
+_JSON_BLOCK_RE = re.compile(r'```json\s*([\s\S]*?)\s*```|(\{[\s\S]*\})')
+
+def _find_json_object(text: str) -> Optional[str]:
+    """
+    Find the first balanced {...} object in a text with a single scan.
+    
+    Braces inside JSON string literals are ignored.
+    
+    Args:
+        text (str): Text that may contain a JSON object
+        
+    Returns:
+        str: The object's source text, or None if there is no balanced object
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+        
+    depth = 0
+    in_string = False
+    escaped = False
+    
+    for i in range(start, len(text)):
+        char = text[i]
+        
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+                
+    return None
+
 class AITools:
     """
     Tools for integrating with AI APIs (Claude, OpenAI) for financial insights and assistance.
@@ -22,9 +251,237 @@ class AITools:
         self.local_config = AI_API['local']
         self.capabilities = AI_API['capabilities']
         
+        # Categorization results keyed by (normalized merchant, is_income), least recently used first
+        self._cat_cache = OrderedDict()
+        self._cat_cache_size = AI_API.get('cache_size', 10000)
+        self._cat_cache_min_confidence = AI_API.get('cache_min_confidence', 0.6)
+        
+        # Response cache for assistant/insights prompts: exact matches first, then embedding
+        # similarity of the user's question within the same context (enabled with
+        # AI_API['capabilities']['semantic_cache'], needs sentence-transformers)
+        self._exact_cache = OrderedDict()
+        self._sem_entries = []
+        self._sem_matrix = None
+        self._sem_cache_size = AI_API.get('semantic_cache_size', 500)
+        self._sem_threshold = AI_API.get('semantic_cache_threshold', 0.92)
+        self._embedder = None
+        self._embedder_failed = False
+        
+        # Reuse pooled connections across API calls instead of a new TCP/TLS handshake per request
+        self._session = self._create_session()
+        
+        # Worker threads for concurrent batch categorization (bounds requests in flight)
+        self._executor = ThreadPoolExecutor(max_workers=AI_API.get('max_concurrency', 4))
+        
+        # HTTP/2 client for the async API and the limit on its requests in flight, created on first use
+        self._aclient = None
+        self._asemaphore = None
+        
+        # Categorization and insights responses persisted across runs, keyed by provider, model
+        # and prompt; the database is opened on the first request that can use it
+        self._disk_cache = None
+        self._disk_cache_tried = False
+        self._disk_cache_lock = threading.Lock()
+        
         # Validate configuration
         self._validate_config()
         
+        # Resolve the provider handler once instead of on every request
+        self._bind_provider()
+        
+    def _create_session(self) -> requests.Session:
+        """
+        Create an HTTP session with connection pooling and retries.
+        
+        Returns:
+            requests.Session: Session shared by all API calls of this instance
+        """
+        retries = Retry(
+            total=_RETRY_TOTAL,
+            backoff_factor=_RETRY_BACKOFF,
+            status_forcelist=list(_RETRY_STATUSES),
+            allowed_methods=["POST"]
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retries)
+        
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({'Content-Type': 'application/json'})
+        return session
+        
+    def _get_aclient(self) -> 'httpx.AsyncClient':
+        """
+        Get the shared async HTTP client, creating it on first use.
+        
+        Returns:
+            httpx.AsyncClient: Client multiplexing requests over HTTP/2 when the h2 package is installed
+        """
+        if self._aclient is None:
+            if httpx is None:
+                raise ImportError("The async AI API requires httpx. Install with: pip install 'httpx[http2]'")
+            self._aclient = httpx.AsyncClient(
+                http2=importlib.util.find_spec('h2') is not None,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+            
+            # Same bound as the sync worker threads, so batches never queue for a pooled connection
+            self._asemaphore = asyncio.Semaphore(AI_API.get('max_concurrency', 4))
+        return self._aclient
+        
+    async def _apost(self, url: str, timeout: float, **kwargs) -> 'httpx.Response':
+        """
+        POST over the shared async client, retrying like the sync session.
+        
+        At most AI_API['max_concurrency'] requests are in flight at once. Connection
+        errors and 429/5xx responses are retried up to _RETRY_TOTAL times with
+        exponential backoff, honoring a numeric Retry-After header.
+        
+        Args:
+            url (str): Request URL
+            timeout (float): Request timeout in seconds
+            **kwargs: Extra arguments for httpx.AsyncClient.post (headers, json)
+            
+        Returns:
+            httpx.Response: The final response, which may still be an error status
+        """
+        client = self._get_aclient()
+        
+        async with self._asemaphore:
+            for attempt in range(_RETRY_TOTAL + 1):
+                delay = _RETRY_BACKOFF * (2 ** attempt)
+                try:
+                    response = await client.post(url, timeout=timeout, **kwargs)
+                except httpx.TransportError:
+                    if attempt == _RETRY_TOTAL:
+                        raise
+                else:
+                    if response.status_code not in _RETRY_STATUSES or attempt == _RETRY_TOTAL:
+                        return response
+                        
+                    retry_after = response.headers.get('Retry-After', '')
+                    if retry_after.isdigit():
+                        delay = max(delay, int(retry_after))
+                        
+                logger.debug("Retrying AI API request in %.1fs (attempt %d)", delay, attempt + 1)
+                await asyncio.sleep(delay)
+        
+    def _open_disk_cache(self) -> Optional[sqlite3.Connection]:
+        """
+        Open the on-disk response cache and prune entries older than AI_API['cache_ttl'] seconds.
+        
+        Returns:
+            sqlite3.Connection: Cache database, or None if disabled (AI_API['cache_path'] set to None) or unavailable
+        """
+        cache_path = AI_API.get('cache_path', '.ai_cache.db')
+        if not cache_path:
+            return None
+            
+        try:
+            conn = sqlite3.connect(cache_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS ai_cache (key TEXT PRIMARY KEY, value BLOB, ts INTEGER)")
+            conn.execute("DELETE FROM ai_cache WHERE ts < ?",
+                         (int(time.time()) - AI_API.get('cache_ttl', 30 * 24 * 3600),))
+            conn.commit()
+            return conn
+        except sqlite3.Error as e:
+            logger.warning("Could not open AI response cache %s: %s", cache_path, e)
+            return None
+            
+    def _get_disk_cache(self) -> Optional[sqlite3.Connection]:
+        """
+        Get the on-disk response cache, opening it on first use.
+        
+        Nothing is created on disk until AI is enabled and a cacheable request is made.
+        
+        Returns:
+            sqlite3.Connection: Cache database, or None if AI is disabled or the cache is unavailable
+        """
+        if not self.is_enabled():
+            return None
+            
+        with self._disk_cache_lock:
+            if self._disk_cache is None and not self._disk_cache_tried:
+                self._disk_cache_tried = True
+                self._disk_cache = self._open_disk_cache()
+        return self._disk_cache
+        
+    def _disk_cache_key(self, prompt: str, json_response: bool, cached_context: Optional[str],
+                        max_tokens: Optional[int], system: Optional[str]) -> str:
+        """Hash everything that determines a response into a disk cache key."""
+        config = {'claude': self.claude_config, 'openai': self.openai_config, 'local': self.local_config}
+        model = config.get(self.provider, {}).get('model')
+        raw = f"{self.provider}|{model}|{json_response}|{max_tokens}|{system}|{cached_context}|{prompt}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+        
+    def _disk_cache_get(self, key: str) -> Optional[Union[str, Dict]]:
+        """Read a response from the disk cache."""
+        with self._disk_cache_lock:
+            row = self._disk_cache.execute("SELECT value FROM ai_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return _loads(row[0])
+        
+    def _disk_cache_put(self, key: str, response: Union[str, Dict]):
+        """
+        Write a response to the disk cache.
+        
+        Only parsed JSON is stored. Categorizations below the in-memory cache's
+        confidence floor are left out, so they are asked again on the next run.
+        
+        Args:
+            key (str): Cache key from _disk_cache_key
+            response (str or dict): AI response
+        """
+        if not isinstance(response, dict):
+            return
+            
+        if isinstance(response.get('results'), list):
+            kept = [item for item in response['results'] if self._is_confident(item)]
+            response = {**response, 'results': kept} if kept else None
+        elif 'confidence' in response and not self._is_confident(response):
+            response = None
+            
+        if not response:
+            return
+            
+        value = _dumps(response).encode()
+        with self._disk_cache_lock:
+            self._disk_cache.execute("INSERT OR REPLACE INTO ai_cache (key, value, ts) VALUES (?, ?, ?)",
+                                     (key, value, int(time.time())))
+            self._disk_cache.commit()
+            
+    def _is_confident(self, result: Any) -> bool:
+        """Check whether a categorization result meets the cache confidence floor."""
+        if not isinstance(result, dict):
+            return False
+        try:
+            return float(result.get('confidence', 0.0)) >= self._cat_cache_min_confidence
+        except (TypeError, ValueError):
+            return False
+            
+    def close(self):
+        """Shut down the categorization worker threads and close pooled HTTP connections."""
+        self._executor.shutdown(wait=True)
+        self._session.close()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+        
+    async def aclose(self):
+        """Close the async HTTP client used by the async API."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+            self._asemaphore = None
+        
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+            
     def _validate_config(self):
         """Validate the AI API configuration."""
         if self.provider == 'claude' and self.claude_config['enabled']:
@@ -40,17 +497,33 @@ class AITools:
                 logger.warning("Local model is enabled but no API URL is provided")
                 
         elif self.provider != 'none':
-            logger.warning(f"Unknown AI provider: {self.provider}")
+            logger.warning("Unknown AI provider: %s", self.provider)
             
-    def is_enabled(self) -> bool:
-        """Check if AI integration is enabled and properly configured."""
+    def _bind_provider(self):
+        """Select the response handler and enabled state for the current provider."""
+        self._responder = {
+            'claude': self._get_claude_response,
+            'openai': self._get_openai_response,
+            'local': self._get_local_response
+        }.get(self.provider, self._get_disabled_response)
+        self._aresponder = {
+            'claude': self._aget_claude_response,
+            'openai': self._aget_openai_response,
+            'local': self._aget_local_response
+        }.get(self.provider, self._aget_disabled_response)
+        
         if self.provider == 'claude':
-            return self.claude_config['enabled'] and bool(self.claude_config['api_key'])
+            self._enabled = self.claude_config['enabled'] and bool(self.claude_config['api_key'])
         elif self.provider == 'openai':
-            return self.openai_config['enabled'] and bool(self.openai_config['api_key'])
+            self._enabled = self.openai_config['enabled'] and bool(self.openai_config['api_key'])
         elif self.provider == 'local':
-            return self.local_config['enabled'] and bool(self.local_config['api_url'])
-        return False
+            self._enabled = self.local_config['enabled'] and bool(self.local_config['api_url'])
+        else:
+            self._enabled = False
+            
+    def is_enabled(self) -> bool:
+        """Check if AI integration is enabled and properly configured."""
+        return self._enabled
         
     def switch_provider(self, provider: str) -> bool:
         """
@@ -63,11 +536,12 @@ class AITools:
             bool: True if successful, False otherwise
         """
         if provider not in ['claude', 'openai', 'local', 'none']:
-            logger.error(f"Unknown AI provider: {provider}")
+            logger.error("Unknown AI provider: %s", provider)
             return False
             
         self.provider = provider
-        logger.info(f"Switched AI provider to {provider}")
+        self._bind_provider()
+        logger.info("Switched AI provider to %s", provider)
         return True
         
     def categorize_transaction(self, description: str, amount: float, date: str) -> Dict[str, Any]:
@@ -82,45 +556,292 @@ class AITools:
         Returns:
             dict: Category prediction with confidence score
         """
+        return self.categorize_transactions_batch([
+            {'description': description, 'amount': amount, 'date': date}
+        ])[0]
+        
+    def categorize_transactions_batch(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Use AI to categorize several transactions, packing up to
+        AI_API['batch_size'] transactions into each request.
+        
+        Args:
+            transactions (list): Dicts with 'description', 'amount' and 'date' keys
+            
+        Returns:
+            list: Category prediction with confidence score for each transaction, in input order
+        """
+        return self._categorize_cached(transactions, concurrent=False)
+        
+    def categorize_many(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Use AI to categorize a large number of transactions, sending batches
+        concurrently (up to AI_API['max_concurrency'] requests in flight).
+        
+        Args:
+            transactions (list): Dicts with 'description', 'amount' and 'date' keys
+            
+        Returns:
+            list: Category prediction with confidence score for each transaction, in input order
+        """
+        return self._categorize_cached(transactions, concurrent=True)
+        
+    def _categorize_cached(self, transactions: List[Dict[str, Any]], concurrent: bool) -> List[Dict[str, Any]]:
+        """
+        Categorize transactions in batches, serving repeated merchants from the cache.
+        
+        The cache is only read and written on the calling thread; worker threads
+        just run the API requests.
+        
+        Args:
+            transactions (list): Dicts with 'description', 'amount' and 'date' keys
+            concurrent (bool): Whether to send batches concurrently
+            
+        Returns:
+            list: Category prediction with confidence score for each transaction, in input order
+        """
         if not self.is_enabled() or not self.capabilities['transaction_categorization']:
-            return {'category': 'uncategorized', 'confidence': 0.0}
+            return [{'category': 'uncategorized', 'confidence': 0.0} for _ in transactions]
             
-        prompt = f"""
-        Analyze this financial transaction and categorize it into exactly one of these categories:
-        - income (salary, deposits, refunds)
-        - housing (mortgage, rent, property taxes)
-        - utilities (electric, water, gas, internet, phone)
-        - groceries (supermarkets, food stores)
-        - dining (restaurants, cafes, food delivery)
-        - transportation (gas, public transit, car services, parking)
-        - healthcare (medical bills, pharmacy, insurance)
-        - entertainment (movies, streaming services, events)
-        - shopping (retail, online purchases, clothing)
-        - personal (haircuts, gym, personal care)
-        - education (tuition, books, courses)
-        - travel (flights, hotels, vacation expenses)
-        - savings (transfers to savings, investments)
-        - debt (credit card payments, loan payments)
-        - miscellaneous (anything that doesn't fit above)
-        
-        Transaction details:
-        Description: {description}
-        Amount: ${amount:.2f}
-        Date: {date}
-        
-        Respond in JSON format with only 'category' and 'confidence' keys.
-        Example: {{"category": "groceries", "confidence": 0.85}}
+        results, keys, batches = self._plan_batches(transactions)
+        
+        if concurrent and len(batches) > 1:
+            futures = {
+                self._executor.submit(self._categorize_chunk, [transactions[i] for i in indexes]): indexes
+                for indexes in batches
+            }
+            completed = ((futures[future], future.result()) for future in as_completed(futures))
+        else:
+            completed = ((indexes, self._categorize_chunk([transactions[i] for i in indexes])) for indexes in batches)
+            
+        for indexes, chunk_results in completed:
+            self._store_batch(results, keys, indexes, chunk_results)
+            
+        return results
+        
+    async def acategorize_transaction(self, description: str, amount: float, date: str) -> Dict[str, Any]:
         """
+        Async counterpart of categorize_transaction.
         
+        Args:
+            description (str): Transaction description
+            amount (float): Transaction amount
+            date (str): Transaction date
+            
+        Returns:
+            dict: Category prediction with confidence score
+        """
+        results = await self.acategorize_many([{'description': description, 'amount': amount, 'date': date}])
+        return results[0]
+        
+    async def acategorize_many(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Async counterpart of categorize_many: batches are sent concurrently over the
+        shared HTTP/2 client, without worker threads (up to AI_API['max_concurrency']
+        requests in flight).
+        
+        Args:
+            transactions (list): Dicts with 'description', 'amount' and 'date' keys
+            
+        Returns:
+            list: Category prediction with confidence score for each transaction, in input order
+        """
+        if not self.is_enabled() or not self.capabilities['transaction_categorization']:
+            return [{'category': 'uncategorized', 'confidence': 0.0} for _ in transactions]
+            
+        results, keys, batches = self._plan_batches(transactions)
+        
+        batch_results = await asyncio.gather(
+            *(self._acategorize_chunk([transactions[i] for i in indexes]) for indexes in batches)
+        )
+        for indexes, chunk_results in zip(batches, batch_results):
+            self._store_batch(results, keys, indexes, chunk_results)
+            
+        return results
+        
+    def _plan_batches(self, transactions: List[Dict[str, Any]]) -> Tuple[List, List, List[List[int]]]:
+        """
+        Fill in cached results and group the remaining transactions into request batches.
+        
+        Args:
+            transactions (list): Dicts with 'description', 'amount' and 'date' keys
+            
+        Returns:
+            tuple: (results with cache hits filled in, cache keys, batches of indexes still to send)
+        """
+        results = [None] * len(transactions)
+        keys = [self._cache_key(t) for t in transactions]
+        
+        # Serve repeated merchants from the cache and only send the misses
+        pending = []
+        for i, key in enumerate(keys):
+            if key in self._cat_cache:
+                self._cat_cache.move_to_end(key)
+                results[i] = self._cat_cache[key]
+            else:
+                pending.append(i)
+                
+        batch_size = max(1, AI_API.get('batch_size', 25))
+        batches = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+        return results, keys, batches
+        
+    def _store_batch(self, results: List, keys: List, indexes: List[int], chunk_results: List[Dict[str, Any]]):
+        """Place one batch's results into the output list and the cache."""
+        for i, result in zip(indexes, chunk_results):
+            results[i] = result
+            self._cache_result(keys[i], result)
+        
+    def _cache_key(self, transaction: Dict[str, Any]) -> Optional[tuple]:
+        """
+        Build the categorization cache key for a transaction.
+        
+        Args:
+            transaction (dict): Dict with 'description' and 'amount' keys
+            
+        Returns:
+            tuple: (normalized merchant, is_income), or None if the description has no merchant text
+        """
+        merchant = _normalize_merchant(transaction['description'])
+        if not merchant:
+            return None
+        return (merchant, transaction['amount'] >= 0)
+        
+    def _cache_result(self, key: Optional[tuple], result: Dict[str, Any]):
+        """
+        Store a confident categorization result, evicting the least recently used entry when full.
+        
+        Args:
+            key (tuple): Cache key from _cache_key
+            result (dict): Category prediction with confidence score
+        """
+        if key is None or result.get('confidence', 0.0) < self._cat_cache_min_confidence:
+            return
+            
+        self._cat_cache[key] = result
+        self._cat_cache.move_to_end(key)
+        if len(self._cat_cache) > self._cat_cache_size:
+            self._cat_cache.popitem(last=False)
+        
+    def _categorize_chunk(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Categorize one batch of transactions with a single AI request.
+        
+        Rows missing from a malformed batch response are retried individually.
+        
+        Args:
+            transactions (list): Dicts with 'description', 'amount' and 'date' keys
+            
+        Returns:
+            list: Category prediction with confidence score for each transaction
+        """
+        if len(transactions) == 1:
+            t = transactions[0]
+            return [self._categorize_single(t['description'], t['amount'], t['date'])]
+            
+        try:
+            response = self._get_ai_response(
+                _batch_prompt(transactions), json_response=True, cached_context=_CATEGORY_TAXONOMY,
+                max_tokens=_CATEGORIZE_MAX_TOKENS + _CATEGORIZE_BATCH_TOKENS_PER_ROW * len(transactions),
+                system=None, persist=True
+            )
+        except Exception as e:
+            logger.error("Error during AI batch categorization: %s", e)
+            return [{'category': 'uncategorized', 'confidence': 0.0} for _ in transactions]
+            
+        by_index = self._batch_results_by_index(response, len(transactions))
+            
+        # Retry only the rows the batch response did not cover
+        return [
+            by_index[i] if i in by_index else self._categorize_single(t['description'], t['amount'], t['date'])
+            for i, t in enumerate(transactions, 1)
+        ]
+        
+    async def _acategorize_chunk(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Async counterpart of _categorize_chunk."""
+        if len(transactions) == 1:
+            t = transactions[0]
+            return [await self._acategorize_single(t['description'], t['amount'], t['date'])]
+            
+        try:
+            response = await self._aget_ai_response(
+                _batch_prompt(transactions), json_response=True, cached_context=_CATEGORY_TAXONOMY,
+                max_tokens=_CATEGORIZE_MAX_TOKENS + _CATEGORIZE_BATCH_TOKENS_PER_ROW * len(transactions),
+                system=None, persist=True
+            )
+        except Exception as e:
+            logger.error("Error during AI batch categorization: %s", e)
+            return [{'category': 'uncategorized', 'confidence': 0.0} for _ in transactions]
+            
+        by_index = self._batch_results_by_index(response, len(transactions))
+        
+        # Retry only the rows the batch response did not cover
+        missing = [(i, t) for i, t in enumerate(transactions, 1) if i not in by_index]
+        retried = await asyncio.gather(
+            *(self._acategorize_single(t['description'], t['amount'], t['date']) for _, t in missing)
+        )
+        by_index.update(zip((i for i, _ in missing), retried))
+        return [by_index[i] for i in range(1, len(transactions) + 1)]
+        
+    def _batch_results_by_index(self, response: Any, count: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Collect the well-formed entries of a batch categorization response.
+        
+        Args:
+            response: Parsed AI response
+            count (int): Number of transactions in the batch
+            
+        Returns:
+            dict: Category prediction with confidence score keyed by 1-based transaction number
+        """
+        by_index = {}
+        if isinstance(response, dict) and isinstance(response.get('results'), list):
+            for item in response['results']:
+                if isinstance(item, dict) and 'index' in item and 'category' in item and 'confidence' in item:
+                    by_index[item['index']] = {'category': item['category'], 'confidence': item['confidence']}
+                    
+        if len(by_index) != count:
+            logger.warning("AI batch categorization returned %d of %d results", len(by_index), count)
+        return by_index
+        
+    def _categorize_single(self, description: str, amount: float, date: str) -> Dict[str, Any]:
+        """
+        Categorize one transaction with its own AI request.
+        
+        Args:
+            description (str): Transaction description
+            amount (float): Transaction amount
+            date (str): Transaction date
+            
+        Returns:
+            dict: Category prediction with confidence score
+        """
         try:
-            response = self._get_ai_response(prompt, json_response=True)
+            # Categorization needs no persona; the taxonomy block carries all the instructions
+            response = self._get_ai_response(_single_prompt(description, amount, date), json_response=True,
+                                             cached_context=_CATEGORY_TAXONOMY, max_tokens=_CATEGORIZE_MAX_TOKENS,
+                                             system=None, persist=True)
             if response and 'category' in response and 'confidence' in response:
                 return response
             else:
-                logger.warning(f"Invalid AI categorization response: {response}")
+                logger.warning("Invalid AI categorization response: %r", response)
                 return {'category': 'uncategorized', 'confidence': 0.0}
         except Exception as e:
-            logger.error(f"Error during AI categorization: {str(e)}")
+            logger.error("Error during AI categorization: %s", e)
+            return {'category': 'uncategorized', 'confidence': 0.0}
+            
+    async def _acategorize_single(self, description: str, amount: float, date: str) -> Dict[str, Any]:
+        """Async counterpart of _categorize_single."""
+        try:
+            response = await self._aget_ai_response(_single_prompt(description, amount, date), json_response=True,
+                                                    cached_context=_CATEGORY_TAXONOMY,
+                                                    max_tokens=_CATEGORIZE_MAX_TOKENS, system=None, persist=True)
+            if response and 'category' in response and 'confidence' in response:
+                return response
+            else:
+                logger.warning("Invalid AI categorization response: %r", response)
+                return {'category': 'uncategorized', 'confidence': 0.0}
+        except Exception as e:
+            logger.error("Error during AI categorization: %s", e)
             return {'category': 'uncategorized', 'confidence': 0.0}
             
     def generate_insights(self, transactions_summary: Dict[str, Any]) -> Dict[str, Any]:
@@ -137,37 +858,48 @@ class AITools:
             return {'insights': []}
             
         # Format the transaction summary data
-        summary_str = json.dumps(transactions_summary, indent=2)
+        summary_str = _dumps(transactions_summary)
         
-        prompt = f"""
-        Analyze this financial transaction summary data and provide 3-5 key insights about spending patterns,
-        unusual expenses, potential savings opportunities, and financial trends.
+        prompt = ''.join((_INSIGHTS_PREFIX, summary_str, _INSIGHTS_SUFFIX))
         
-        Transaction Summary:
-        {summary_str}
+        try:
+            # Insights prompts differ only in their numbers, so only exact repeats may share an answer
+            response = self._get_cached_ai_response(prompt, json_response=True, max_tokens=_INSIGHTS_MAX_TOKENS,
+                                                    persist=True)
+            if response and 'insights' in response:
+                return response
+            else:
+                logger.warning("Invalid AI insights response: %r", response)
+                return {'insights': []}
+        except Exception as e:
+            logger.error("Error generating AI insights: %s", e)
+            return {'insights': []}
+            
+    async def agenerate_insights(self, transactions_summary: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async counterpart of generate_insights.
         
-        Respond in JSON format with an 'insights' array containing objects with 'title' and 'description' fields.
-        Example:
-        {{
-          "insights": [
-            {{
-              "title": "Dining expenses increased by 25%",
-              "description": "Your spending on restaurants and takeout has increased significantly compared to previous months."
-            }},
-            ...
-          ]
-        }}
+        Args:
+            transactions_summary (dict): Summary of transaction data
+            
+        Returns:
+            dict: Financial insights and recommendations
         """
+        if not self.is_enabled() or not self.capabilities['spending_insights']:
+            return {'insights': []}
+            
+        prompt = ''.join((_INSIGHTS_PREFIX, _dumps(transactions_summary), _INSIGHTS_SUFFIX))
         
         try:
-            response = self._get_ai_response(prompt, json_response=True)
+            response = await self._aget_cached_ai_response(prompt, json_response=True,
+                                                           max_tokens=_INSIGHTS_MAX_TOKENS, persist=True)
             if response and 'insights' in response:
                 return response
             else:
-                logger.warning(f"Invalid AI insights response: {response}")
+                logger.warning("Invalid AI insights response: %r", response)
                 return {'insights': []}
         except Exception as e:
-            logger.error(f"Error generating AI insights: {str(e)}")
+            logger.error("Error generating AI insights: %s", e)
             return {'insights': []}
             
     def generate_budget_recommendations(self, income: float, expenses: Dict[str, float]) -> Dict[str, Any]:
@@ -185,133 +917,366 @@ class AITools:
             return {'recommendations': []}
             
         # Format the expense data
-        expenses_str = json.dumps(expenses, indent=2)
-        
-        prompt = f"""
-        Create personalized budget recommendations based on the following financial data.
-        Use the 50/30/20 rule (50% needs, 30% wants, 20% savings) as a general guideline.
-        
-        Monthly Income: ${income:.2f}
+        expenses_str = _dumps(expenses)
         
-        Current Monthly Expenses by Category:
-        {expenses_str}
-        
-        Respond in JSON format with a 'recommendations' array containing objects with 'category', 'current_amount',
-        'recommended_amount', and 'explanation' fields.
-        Example:
-        {{
-          "recommendations": [
-            {{
-              "category": "dining",
-              "current_amount": 350.00,
-              "recommended_amount": 250.00,
-              "explanation": "Reducing dining out expenses by $100 would bring this category within the recommended range."
-            }},
-            ...
-          ]
-        }}
-        """
+        prompt = ''.join((
+            _RECOMMENDATIONS_PREFIX,
+            f"Monthly Income: ${income:.2f}\n\nCurrent Monthly Expenses by Category:\n{expenses_str}",
+            _RECOMMENDATIONS_SUFFIX
+        ))
         
         try:
-            response = self._get_ai_response(prompt, json_response=True)
+            response = self._get_ai_response(prompt, json_response=True, max_tokens=_RECOMMENDATIONS_MAX_TOKENS)
             if response and 'recommendations' in response:
                 return response
             else:
-                logger.warning(f"Invalid AI budget recommendations response: {response}")
+                logger.warning("Invalid AI budget recommendations response: %r", response)
                 return {'recommendations': []}
         except Exception as e:
-            logger.error(f"Error generating AI budget recommendations: {str(e)}")
+            logger.error("Error generating AI budget recommendations: %s", e)
             return {'recommendations': []}
             
-    def financial_assistant(self, user_query: str, context: Optional[Dict[str, Any]] = None) -> str:
+    def financial_assistant(self, user_query: str, context: Optional[Dict[str, Any]] = None,
+                            stream: bool = False) -> Union[str, Iterator[str]]:
         """
         Financial assistant that can answer questions about budgeting and financial data.
         
         Args:
             user_query (str): User's question
             context (dict, optional): Optional context data
+            stream (bool): Return the response incrementally as it is generated
             
         Returns:
-            str: Assistant's response
+            Union[str, Iterator[str]]: Assistant's response, or an iterator of text chunks when streaming
         """
         if not self.is_enabled() or not self.capabilities['financial_assistant']:
             return "AI financial assistant is not enabled."
             
         context_str = ""
         if context:
-            context_str = f"Context:\n{json.dumps(context, indent=2)}\n\n"
+            context_str = f"Context:\n{_dumps(context)}\n\n"
             
-        prompt = f"""
-        You are a helpful financial assistant. Answer the following question about budgeting, finances, or the user's
-        financial data provided in the context.
-        
-        {context_str}
-        
-        User question: {user_query}
-        
-        Provide a clear, concise, and helpful response. If you don't have enough information to answer accurately,
-        say so and suggest what additional information would be helpful.
-        """
+        prompt = ''.join((_ASSISTANT_PREFIX, context_str, f"User question: {user_query}", _ASSISTANT_SUFFIX))
         
         try:
-            response = self._get_ai_response(prompt)
+            if stream:
+                return self._guard_stream(self._get_ai_response(prompt, stream=True))
+            # Only the question itself is compared by similarity, and only against answers over the same context
+            scope = hashlib.blake2b(context_str.encode(), digest_size=16).hexdigest()
+            response = self._get_cached_ai_response(prompt, query=user_query, scope=scope)
             return response
         except Exception as e:
-            logger.error(f"Error in financial assistant: {str(e)}")
+            logger.error("Error in financial assistant: %s", e)
             return "Sorry, I was unable to process your question at this time."
             
-    def _get_ai_response(self, prompt: str, json_response: bool = False) -> Union[str, Dict]:
+    def _guard_stream(self, chunks: Iterator[str]) -> Iterator[str]:
         """
-        Get a response from the configured AI provider.
+        Pass through streamed text chunks, ending with an apology if the stream fails midway.
+        
+        Args:
+            chunks (Iterator[str] or str): Text chunks from the AI provider, or a whole
+                message when the provider returned an error string instead of a stream
+            
+        Returns:
+            Iterator[str]: The same chunks
+        """
+        # A plain string would otherwise be iterated one character at a time
+        if isinstance(chunks, str):
+            yield chunks
+            return
+            
+        try:
+            yield from chunks
+        except Exception as e:
+            logger.error("Error in financial assistant stream: %s", e)
+            yield "\nSorry, the response was interrupted."
+            
+    def _get_cached_ai_response(self, prompt: str, json_response: bool = False,
+                                max_tokens: Optional[int] = None, query: Optional[str] = None,
+                                scope: str = '', persist: bool = False) -> Union[str, Dict]:
+        """
+        Get a response from the configured AI provider, reusing cached responses
+        for identical prompts, or for similar questions when the semantic cache is enabled.
+        
+        Only used for free-form prompts (assistant, insights); categorization prompts
+        differ in a few words and must never share answers.
         
         Args:
             prompt (str): The prompt to send to the AI
             json_response (bool): Whether to parse the response as JSON
+            max_tokens (int, optional): Output token cap overriding the provider default
+            query (str, optional): The user's own question, embedded for similarity matching;
+                None limits reuse to exact repeats of the prompt
+            scope (str): Key of everything in the prompt besides query (e.g. a context hash);
+                similar questions only share an answer within the same scope
+            persist (bool): Also keep the response in the on-disk cache across runs
             
         Returns:
             Union[str, dict]: The AI's response as string or parsed JSON
         """
-        if self.provider == 'claude':
-            return self._get_claude_response(prompt, json_response)
-        elif self.provider == 'openai':
-            return self._get_openai_response(prompt, json_response)
-        elif self.provider == 'local':
-            return self._get_local_response(prompt, json_response)
+        if not self.capabilities.get('semantic_cache'):
+            return self._get_ai_response(prompt, json_response, max_tokens=max_tokens, persist=persist)
+            
+        cached, embedding = self._lookup_response(prompt, json_response, query, scope)
+        if cached is not None:
+            return cached
+            
+        response = self._get_ai_response(prompt, json_response, max_tokens=max_tokens, persist=persist)
+        self._store_response(prompt, json_response, response, embedding, scope)
+        return response
+        
+    async def _aget_cached_ai_response(self, prompt: str, json_response: bool = False,
+                                       max_tokens: Optional[int] = None, query: Optional[str] = None,
+                                       scope: str = '', persist: bool = False) -> Union[str, Dict]:
+        """Async counterpart of _get_cached_ai_response."""
+        if not self.capabilities.get('semantic_cache'):
+            return await self._aget_ai_response(prompt, json_response, max_tokens=max_tokens, persist=persist)
+            
+        cached, embedding = self._lookup_response(prompt, json_response, query, scope)
+        if cached is not None:
+            return cached
+            
+        response = await self._aget_ai_response(prompt, json_response, max_tokens=max_tokens, persist=persist)
+        self._store_response(prompt, json_response, response, embedding, scope)
+        return response
+        
+    def _lookup_response(self, prompt: str, json_response: bool, query: Optional[str] = None,
+                         scope: str = '') -> Tuple[Optional[Union[str, Dict]], Optional[np.ndarray]]:
+        """
+        Look up a prompt in the exact and semantic response caches.
+        
+        Args:
+            prompt (str): The prompt to send to the AI
+            json_response (bool): Whether the response is parsed JSON
+            query (str, optional): Text to match by similarity; None checks exact repeats only
+            scope (str): Only semantic entries stored with the same scope are candidates
+            
+        Returns:
+            tuple: (cached response or None, query embedding for storing a new response)
+        """
+        # Exact repeats skip the embedding step entirely
+        key = (prompt, json_response)
+        if key in self._exact_cache:
+            self._exact_cache.move_to_end(key)
+            return self._exact_cache[key], None
+            
+        # Exact-only responses are neither matched nor stored by similarity
+        if query is None:
+            return None, None
+            
+        embedding = self._embed(query)
+        if embedding is None:
+            return None, None
+            
+        # Scope and format are compared exactly before any similarity is computed
+        candidates = [
+            i for i, entry in enumerate(self._sem_entries)
+            if entry['scope'] == scope and entry['json_response'] == json_response
+        ]
+        if candidates:
+            similarities = self._sem_matrix[candidates] @ embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self._sem_threshold:
+                logger.debug("Semantic cache hit (similarity %.3f)", similarities[best])
+                entry = self._sem_entries[candidates[best]]
+                entry['last_used'] = time.time()
+                return entry['response'], None
+                
+        return None, embedding
+        
+    def _store_response(self, prompt: str, json_response: bool, response: Union[str, Dict],
+                        embedding: Optional[np.ndarray], scope: str = ''):
+        """Add a fresh AI response to the exact and semantic response caches."""
+        if not response:
+            return
+            
+        self._exact_cache[(prompt, json_response)] = response
+        if len(self._exact_cache) > self._sem_cache_size:
+            self._exact_cache.popitem(last=False)
+            
+        if embedding is not None:
+            self._add_semantic_entry(embedding, response, json_response, scope)
+        
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Embed a question for the semantic cache, loading the embedding model on first use.
+        
+        Args:
+            text (str): Question text
+            
+        Returns:
+            np.ndarray: Unit-length embedding, or None if sentence-transformers is unavailable
+        """
+        if self._embedder is None and not self._embedder_failed:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._embedder = SentenceTransformer(AI_API.get('semantic_cache_model', 'all-MiniLM-L6-v2'))
+            except ImportError:
+                logger.warning("sentence-transformers not installed; semantic cache limited to exact matches. "
+                               "Install with: pip install sentence-transformers")
+                self._embedder_failed = True
+            except Exception as e:
+                logger.warning("Could not load semantic cache model: %s", e)
+                self._embedder_failed = True
+                
+        if self._embedder is None:
+            return None
+            
+        return self._embedder.encode(text, normalize_embeddings=True).astype(np.float32)
+        
+    def _add_semantic_entry(self, embedding: np.ndarray, response: Union[str, Dict], json_response: bool,
+                            scope: str = ''):
+        """
+        Add a response to the semantic cache, evicting the least recently used entry when full.
+        
+        Args:
+            embedding (np.ndarray): Question embedding
+            response (str or dict): AI response to cache
+            json_response (bool): Whether the response is parsed JSON
+            scope (str): Key of the rest of the prompt, matched exactly on lookup
+        """
+        entry = {'response': response, 'json_response': json_response, 'scope': scope, 'last_used': time.time()}
+        
+        if self._sem_matrix is None:
+            self._sem_matrix = embedding[np.newaxis, :]
         else:
-            return "AI integration is not enabled."
+            self._sem_matrix = np.vstack([self._sem_matrix, embedding])
+        self._sem_entries.append(entry)
+        
+        if len(self._sem_entries) > self._sem_cache_size:
+            oldest = min(range(len(self._sem_entries)), key=lambda i: self._sem_entries[i]['last_used'])
+            del self._sem_entries[oldest]
+            self._sem_matrix = np.delete(self._sem_matrix, oldest, axis=0)
             
-    def _get_claude_response(self, prompt: str, json_response: bool = False) -> Union[str, Dict]:
-        """Get a response from Claude API."""
-        if not self.claude_config['api_key']:
-            return "Claude API key is not configured."
+    def _get_ai_response(self, prompt: str, json_response: bool = False, stream: bool = False,
+                         cached_context: Optional[str] = None,
+                         max_tokens: Optional[int] = None,
+                         system: Optional[str] = _SYSTEM_PROMPT,
+                         persist: bool = False) -> Union[str, Dict, Iterator[str]]:
+        """
+        Get a response from the configured AI provider.
+        
+        Args:
+            prompt (str): The prompt to send to the AI
+            json_response (bool): Whether to parse the response as JSON
+            stream (bool): Return an iterator of text chunks as they arrive (text responses only)
+            cached_context (str, optional): Fixed instructions sent ahead of the prompt so the
+                provider can cache them as part of the prompt prefix
+            max_tokens (int, optional): Output token cap overriding the provider default
+            system (str, optional): Persona system prompt; None sends no system prompt besides cached_context
+            persist (bool): Reuse and store the response in the on-disk cache (categorization and insights only)
+            
+        Returns:
+            Union[str, dict, Iterator[str]]: The AI's response as string, parsed JSON, or text chunks
+        """
+        if stream or not persist or self._get_disk_cache() is None:
+            return self._responder(prompt, json_response, stream, cached_context, max_tokens, system)
+            
+        # Responses saved by earlier runs skip the network entirely
+        key = self._disk_cache_key(prompt, json_response, cached_context, max_tokens, system)
+        response = self._disk_cache_get(key)
+        if response is None:
+            response = self._responder(prompt, json_response, stream, cached_context, max_tokens, system)
+            self._disk_cache_put(key, response)
+        return response
+        
+    def _get_disabled_response(self, *args, **kwargs) -> str:
+        """Response handler used when no AI provider is selected."""
+        return "AI integration is not enabled."
+        
+    async def _aget_ai_response(self, prompt: str, json_response: bool = False,
+                                cached_context: Optional[str] = None,
+                                max_tokens: Optional[int] = None,
+                                system: Optional[str] = _SYSTEM_PROMPT,
+                                persist: bool = False) -> Union[str, Dict]:
+        """
+        Async counterpart of _get_ai_response (no streaming).
+        
+        Args:
+            prompt (str): The prompt to send to the AI
+            json_response (bool): Whether to parse the response as JSON
+            cached_context (str, optional): Fixed instructions sent ahead of the prompt
+            max_tokens (int, optional): Output token cap overriding the provider default
+            system (str, optional): Persona system prompt; None sends no system prompt besides cached_context
+            persist (bool): Reuse and store the response in the on-disk cache (categorization and insights only)
+            
+        Returns:
+            Union[str, dict]: The AI's response as string or parsed JSON
+        """
+        if not persist or self._get_disk_cache() is None:
+            return await self._aresponder(prompt, json_response, cached_context, max_tokens, system)
             
+        key = self._disk_cache_key(prompt, json_response, cached_context, max_tokens, system)
+        response = self._disk_cache_get(key)
+        if response is None:
+            response = await self._aresponder(prompt, json_response, cached_context, max_tokens, system)
+            self._disk_cache_put(key, response)
+        return response
+        
+    async def _aget_disabled_response(self, *args, **kwargs) -> str:
+        """Async response handler used when no AI provider is selected."""
+        return "AI integration is not enabled."
+        
+    def _claude_request(self, prompt: str, json_response: bool, stream: bool, cached_context: Optional[str],
+                        max_tokens: Optional[int],
+                        system: Optional[str]) -> Tuple[str, Dict, Dict, float]:
+        """Build the URL, headers, payload and timeout for a Claude API call."""
         headers = {
-            'Content-Type': 'application/json',
             'anthropic-version': '2023-06-01',
+            'anthropic-beta': 'prompt-caching-2024-07-31',
             'x-api-key': self.claude_config['api_key']
         }
         
         data = {
             'model': self.claude_config['model'],
-            'max_tokens': self.claude_config['max_tokens'],
+            'max_tokens': max_tokens or self.claude_config['max_tokens'],
             'temperature': self.claude_config['temperature'],
-            'system': "You are a helpful financial assistant that provides accurate and concise information about personal finance and budgeting.",
             'messages': [
                 {"role": "user", "content": prompt}
             ]
         }
         
+        # Fixed context goes in its own system block marked for prompt caching
+        blocks = [{"type": "text", "text": system}] if system else []
+        if cached_context:
+            blocks.append({"type": "text", "text": cached_context, "cache_control": {"type": "ephemeral"}})
+        if blocks:
+            data['system'] = blocks
+        
+        if stream:
+            data['stream'] = True
+            
+        return 'https://api.anthropic.com/v1/messages', headers, data, self.claude_config['timeout']
+        
+    def _claude_text(self, response_data: Dict) -> str:
+        """Extract the completion text from a Claude API response body."""
+        usage = response_data.get('usage', {})
+        logger.debug("Claude prompt cache: %d tokens read, %d tokens written",
+                     usage.get('cache_read_input_tokens', 0), usage.get('cache_creation_input_tokens', 0))
+        return response_data['content'][0]['text']
+        
+    def _get_claude_response(self, prompt: str, json_response: bool = False, stream: bool = False,
+                             cached_context: Optional[str] = None,
+                             max_tokens: Optional[int] = None,
+                             system: Optional[str] = _SYSTEM_PROMPT) -> Union[str, Dict, Iterator[str]]:
+        """Get a response from Claude API."""
+        if not self.claude_config['api_key']:
+            return "Claude API key is not configured."
+            
+        url, headers, data, timeout = self._claude_request(prompt, json_response, stream, cached_context,
+                                                           max_tokens, system)
+            
         try:
-            response = requests.post(
-                'https://api.anthropic.com/v1/messages',
-                headers=headers,
-                json=data,
-                timeout=self.claude_config['timeout']
-            )
-            response.raise_for_status()
+            response = self._session.post(url, headers=headers, json=data, timeout=timeout, stream=True)
+            _raise_for_status(response)
             
-            response_data = response.json()
-            response_text = response_data['content'][0]['text']
+            if stream:
+                return self._iter_claude_stream(response)
+                
+            if self._is_large_response(response):
+                response_text = self._stream_response_text(response, 'content.item.text')
+            else:
+                response_text = self._claude_text(_loads(response.content))
             
             # Extract JSON if requested
             if json_response:
@@ -319,82 +1284,160 @@ class AITools:
             return response_text
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Claude API error: {str(e)}")
+            logger.error("Claude API error: %s", e)
             raise
             
-    def _get_openai_response(self, prompt: str, json_response: bool = False) -> Union[str, Dict]:
-        """Get a response from OpenAI API."""
-        if not self.openai_config['api_key']:
-            return "OpenAI API key is not configured."
+    async def _aget_claude_response(self, prompt: str, json_response: bool = False,
+                                    cached_context: Optional[str] = None,
+                                    max_tokens: Optional[int] = None,
+                                    system: Optional[str] = _SYSTEM_PROMPT) -> Union[str, Dict]:
+        """Get a response from Claude API over the shared async client."""
+        if not self.claude_config['api_key']:
+            return "Claude API key is not configured."
             
+        url, headers, data, timeout = self._claude_request(prompt, json_response, False, cached_context,
+                                                           max_tokens, system)
+        
+        try:
+            response = await self._apost(url, timeout, headers=headers, json=data)
+            _raise_for_status(response)
+            response_text = self._claude_text(_loads(response.content))
+            
+            if json_response:
+                return self._extract_json(response_text)
+            return response_text
+            
+        except _ASYNC_HTTP_ERRORS as e:
+            logger.error("Claude API error: %s", e)
+            raise
+            
+    def _openai_request(self, prompt: str, json_response: bool, stream: bool, cached_context: Optional[str],
+                        max_tokens: Optional[int],
+                        system: Optional[str]) -> Tuple[str, Dict, Dict, float]:
+        """Build the URL, headers, payload and timeout for an OpenAI API call."""
         headers = {
-            'Content-Type': 'application/json',
             'Authorization': f"Bearer {self.openai_config['api_key']}"
         }
         
-        response_format = {"type": "json_object"} if json_response else None
+        # OpenAI caches identical prompt prefixes automatically, so the fixed text goes first
+        messages = [{"role": "user", "content": prompt}]
+        system_text = '\n\n'.join(part for part in (system, cached_context) if part)
+        if system_text:
+            messages.insert(0, {"role": "system", "content": system_text})
         
         data = {
             'model': self.openai_config['model'],
-            'messages': [
-                {"role": "system", "content": "You are a helpful financial assistant that provides accurate and concise information about personal finance and budgeting."},
-                {"role": "user", "content": prompt}
-            ],
-            'max_tokens': self.openai_config['max_tokens'],
+            'messages': messages,
+            'max_tokens': max_tokens or self.openai_config['max_tokens'],
             'temperature': self.openai_config['temperature']
         }
         
-        if response_format:
-            data['response_format'] = response_format
+        # JSON mode still cuts off at max_tokens, so callers keep the extraction fallback
+        if json_response:
+            data['response_format'] = {"type": "json_object"}
+            
+        if stream:
+            data['stream'] = True
+            
+        return 'https://api.openai.com/v1/chat/completions', headers, data, self.openai_config['timeout']
+        
+    def _openai_text(self, response_data: Dict) -> str:
+        """Extract the completion text from an OpenAI API response body."""
+        if logger.isEnabledFor(logging.DEBUG):
+            details = response_data.get('usage', {}).get('prompt_tokens_details') or {}
+            logger.debug("OpenAI prompt cache: %d tokens read", details.get('cached_tokens', 0))
+        return response_data['choices'][0]['message']['content']
+        
+    def _get_openai_response(self, prompt: str, json_response: bool = False, stream: bool = False,
+                             cached_context: Optional[str] = None,
+                             max_tokens: Optional[int] = None,
+                             system: Optional[str] = _SYSTEM_PROMPT) -> Union[str, Dict, Iterator[str]]:
+        """Get a response from OpenAI API."""
+        if not self.openai_config['api_key']:
+            return "OpenAI API key is not configured."
+            
+        url, headers, data, timeout = self._openai_request(prompt, json_response, stream, cached_context,
+                                                           max_tokens, system)
         
         try:
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers=headers,
-                json=data,
-                timeout=self.openai_config['timeout']
-            )
-            response.raise_for_status()
+            response = self._session.post(url, headers=headers, json=data, timeout=timeout, stream=True)
+            _raise_for_status(response)
             
-            response_data = response.json()
-            response_text = response_data['choices'][0]['message']['content']
+            if stream:
+                return self._iter_openai_stream(response)
+                
+            if self._is_large_response(response):
+                response_text = self._stream_response_text(response, 'choices.item.message.content')
+            else:
+                response_text = self._openai_text(_loads(response.content))
             
-            # Extract JSON if requested and not using response_format
-            if json_response and not response_format:
+            if json_response:
                 return self._extract_json(response_text)
-            elif json_response:
-                return json.loads(response_text)
             return response_text
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"OpenAI API error: {str(e)}")
+            logger.error("OpenAI API error: %s", e)
             raise
             
-    def _get_local_response(self, prompt: str, json_response: bool = False) -> Union[str, Dict]:
-        """Get a response from a local API (e.g., Ollama)."""
-        if not self.local_config['api_url']:
-            return "Local model API URL is not configured."
+    async def _aget_openai_response(self, prompt: str, json_response: bool = False,
+                                    cached_context: Optional[str] = None,
+                                    max_tokens: Optional[int] = None,
+                                    system: Optional[str] = _SYSTEM_PROMPT) -> Union[str, Dict]:
+        """Get a response from OpenAI API over the shared async client."""
+        if not self.openai_config['api_key']:
+            return "OpenAI API key is not configured."
             
-        headers = {
-            'Content-Type': 'application/json'
-        }
+        url, headers, data, timeout = self._openai_request(prompt, json_response, False, cached_context,
+                                                           max_tokens, system)
         
+        try:
+            response = await self._apost(url, timeout, headers=headers, json=data)
+            _raise_for_status(response)
+            response_text = self._openai_text(_loads(response.content))
+            
+            if json_response:
+                return self._extract_json(response_text)
+            return response_text
+            
+        except _ASYNC_HTTP_ERRORS as e:
+            logger.error("OpenAI API error: %s", e)
+            raise
+            
+    def _local_request(self, prompt: str, stream: bool, cached_context: Optional[str],
+                       max_tokens: Optional[int]) -> Tuple[str, Dict, float]:
+        """Build the URL, payload and timeout for a local API call."""
+        if cached_context:
+            prompt = f"{cached_context}\n\n{prompt}"
+            
         data = {
             'model': self.local_config['model'],
             'prompt': prompt,
-            'stream': False
+            'stream': stream
         }
         
+        if max_tokens:
+            data['options'] = {'num_predict': max_tokens}
+            
+        return self.local_config['api_url'], data, self.local_config['timeout']
+        
+    def _get_local_response(self, prompt: str, json_response: bool = False, stream: bool = False,
+                            cached_context: Optional[str] = None,
+                            max_tokens: Optional[int] = None,
+                            system: Optional[str] = _SYSTEM_PROMPT) -> Union[str, Dict, Iterator[str]]:
+        """Get a response from a local API (e.g., Ollama). The system prompt is not sent to local models."""
+        if not self.local_config['api_url']:
+            return "Local model API URL is not configured."
+            
+        url, data, timeout = self._local_request(prompt, stream, cached_context, max_tokens)
+        
         try:
-            response = requests.post(
-                self.local_config['api_url'],
-                headers=headers,
-                json=data,
-                timeout=self.local_config['timeout']
-            )
-            response.raise_for_status()
+            response = self._session.post(url, json=data, timeout=timeout, stream=stream)
+            _raise_for_status(response)
             
-            response_data = response.json()
+            if stream:
+                return self._iter_local_stream(response)
+                
+            response_data = _loads(response.content)
             response_text = response_data.get('response', '')
             
             # Extract JSON if requested
@@ -403,9 +1446,124 @@ class AITools:
             return response_text
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Local API error: {str(e)}")
+            logger.error("Local API error: %s", e)
+            raise
+            
+    async def _aget_local_response(self, prompt: str, json_response: bool = False,
+                                   cached_context: Optional[str] = None,
+                                   max_tokens: Optional[int] = None,
+                                   system: Optional[str] = _SYSTEM_PROMPT) -> Union[str, Dict]:
+        """Get a response from a local API (e.g., Ollama) over the shared async client, without a system prompt."""
+        if not self.local_config['api_url']:
+            return "Local model API URL is not configured."
+            
+        url, data, timeout = self._local_request(prompt, False, cached_context, max_tokens)
+        
+        try:
+            response = await self._apost(url, timeout, json=data)
+            _raise_for_status(response)
+            response_text = _loads(response.content).get('response', '')
+            
+            if json_response:
+                return self._extract_json(response_text)
+            return response_text
+            
+        except _ASYNC_HTTP_ERRORS as e:
+            logger.error("Local API error: %s", e)
             raise
             
+    def _is_large_response(self, response: requests.Response) -> bool:
+        """Check whether a response body is big enough to be worth stream-parsing."""
+        if ijson is None:
+            return False
+        try:
+            return int(response.headers.get('Content-Length', 0)) > _STREAM_PARSE_MIN_BYTES
+        except ValueError:
+            return False
+            
+    def _stream_response_text(self, response: requests.Response, path: str) -> str:
+        """
+        Extract the completion text from a large JSON response body without loading the whole body.
+        
+        Args:
+            response (requests.Response): Response opened with stream=True
+            path (str): ijson prefix of the text field(s) to extract
+            
+        Returns:
+            str: Concatenated text of all matching fields
+        """
+        with response:
+            response.raw.decode_content = True
+            return ''.join(ijson.items(response.raw, path))
+            
+    def _iter_claude_stream(self, response: requests.Response) -> Iterator[str]:
+        """
+        Yield text deltas from a Claude server-sent event stream.
+        
+        Args:
+            response (requests.Response): Streaming response
+            
+        Returns:
+            Iterator[str]: Text chunks in order
+        """
+        with response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                    
+                event = json.loads(line[5:])
+                if event.get('type') == 'content_block_delta':
+                    text = event.get('delta', {}).get('text')
+                    if text:
+                        yield text
+                elif event.get('type') == 'message_stop':
+                    break
+                    
+    def _iter_openai_stream(self, response: requests.Response) -> Iterator[str]:
+        """
+        Yield content deltas from an OpenAI server-sent event stream.
+        
+        Args:
+            response (requests.Response): Streaming response
+            
+        Returns:
+            Iterator[str]: Text chunks in order
+        """
+        with response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                    
+                payload = line[5:].strip()
+                if payload == '[DONE]':
+                    break
+                    
+                choices = json.loads(payload).get('choices') or [{}]
+                content = choices[0].get('delta', {}).get('content')
+                if content:
+                    yield content
+                    
+    def _iter_local_stream(self, response: requests.Response) -> Iterator[str]:
+        """
+        Yield text from a local model's newline-delimited JSON stream (Ollama format).
+        
+        Args:
+            response (requests.Response): Streaming response
+            
+        Returns:
+            Iterator[str]: Text chunks in order
+        """
+        with response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    continue
+                    
+                chunk = json.loads(line)
+                if chunk.get('response'):
+                    yield chunk['response']
+                if chunk.get('done'):
+                    break
+                    
     def _extract_json(self, text: str) -> Dict:
         """
         Extract JSON from a text response.
@@ -420,28 +1578,25 @@ class AITools:
             # Try to parse the whole text as JSON
             return json.loads(text)
         except json.JSONDecodeError:
-            # Try to extract JSON using regex
-            import re
-            json_match = re.search(r'```json\s*([\s\S]*?)\s*```|({[\s\S]*})', text)
+            pass
             
-            if json_match:
-                json_str = json_match.group(1) or json_match.group(2)
-                try:
-                    return json.loads(json_str)
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse extracted JSON: {json_str}")
-                    
-            # Fallback: try to find any JSON-like structure
+        # Try a fenced ```json block, or everything between the outer braces
+        json_match = _JSON_BLOCK_RE.search(text)
+        if json_match:
+            json_str = json_match.group(1) or json_match.group(2)
+            try:
+                return json.loads(json_str)
+            except json.JSONDecodeError:
+                logger.warning("Failed to parse extracted JSON: %s", json_str)
+                
+        # Fallback: the first balanced {...} object in the text
+        json_str = _find_json_object(text)
+        if json_str:
             try:
-                import ast
-                for line in text.split('\n'):
-                    line = line.strip()
-                    if line.startswith('{') and line.endswith('}'):
-                        # Replace single quotes with double quotes for JSON compatibility
-                        line = line.replace("'", '"')
-                        return json.loads(line)
-            except (json.JSONDecodeError, SyntaxError, ValueError):
+                return json.loads(json_str)
+            except json.JSONDecodeError:
                 pass
                 
-            logger.warning(f"Could not extract JSON from response: {text[:100]}...")
-            return {}
\ No newline at end of file
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning("Could not extract JSON from response: %s...", text[:100])
+        return {}
\ No newline at end of file
@@ -5,6 +5,8 @@ import pandas as pd
 import numpy as np
 import re
 import os
+import importlib.util
+from collections import OrderedDict
 from pathlib import Path
 import joblib
 from datetime import datetime
@@ -13,6 +15,76 @@ from configs.config import DEFAULT_CATEGORIES, AI_MODEL, AI_API
 from .logger import logger
 from .ai_tools import AITools
 
+# Resolve the model location once; creating the directory can fail on read-only installs
+_MODEL_PATH = Path(AI_MODEL['model_path'])
+try:
+    _MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+except OSError:
+    pass
+
+# zlib level 3 by default, which every joblib install can read back; AI_MODEL['model_compress']
+# can opt in to e.g. ('lz4', 3) for faster loads where lz4 is installed on every machine using the model
+_MODEL_COMPRESS = AI_MODEL.get('model_compress', 3)
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Below this many rows, worker start-up costs more than the rule scan itself
+_PARALLEL_RULES_MIN_ROWS = 5000
+
+# Arrow-backed strings let str.contains use pyarrow's regex kernel instead of
+# decoding a Python object per row
+_has_pyarrow = importlib.util.find_spec('pyarrow') is not None
+
+# numba itself is only imported once a large rule scan needs the compiled kernel
+_has_numba = importlib.util.find_spec('numba') is not None
+
+def _rule_chunk(texts, patterns):
+    """
+    Match a chunk of descriptions against category patterns.
+    
+    Module-level so joblib workers can run it on their own chunk.
+    
+    Args:
+        texts (pd.Series): Transaction descriptions
+        patterns (list): (category index, case-insensitive compiled regex) pairs in category order
+        
+    Returns:
+        np.ndarray: Index of the first matching category per row, or -1
+    """
+    # -1 marks rows that no category has matched yet
+    codes = np.full(len(texts), -1, dtype=np.int16)
+    
+    for cat_id, pattern in patterns:
+        # Later categories only need to search the rows still unassigned
+        remaining = np.flatnonzero(codes == -1)
+        if not len(remaining):
+            break
+            
+        mask = texts.iloc[remaining].str.contains(pattern.pattern, case=False, regex=True, na=False).to_numpy(dtype=bool)
+        codes[remaining[mask]] = cat_id
+        
+    return codes
+
+def _format_date(date, today=None):
+    """
+    Format a transaction date for the AI API, defaulting to today.
+    
+    Args:
+        date (datetime, optional): Transaction date
+        today (str, optional): Precomputed YYYY-MM-DD for missing dates, so
+            batch callers read the clock once rather than per row
+        
+    Returns:
+        str: Date as YYYY-MM-DD
+    """
+    if date is None or pd.isna(date):
+        return today or datetime.now().strftime("%Y-%m-%d")
+        
+    return date.strftime("%Y-%m-%d")
+
 class Categorizer:
     """
     Class for categorizing financial transactions using rules and/or ML.
@@ -29,23 +101,72 @@ class Categorizer:
         self.ai_model = None
         self.model_loaded = False
         
+        # Build the keyword matcher once instead of per transaction
+        self._build_matchers()
+        
+        # LRU memo of normalized description -> category
+        self._cache = OrderedDict()
+        self._cache_size = AI_MODEL.get('cache_size', 10000)
+        
         # Initialize AI tools for API-based categorization
         self.ai_tools = AITools()
         
-        # Try to load pre-trained model if AI is enabled
-        if AI_MODEL['enabled']:
+        # The pre-trained model (and sklearn with it) is loaded on first use
+        self._model_load_attempted = False
+            
+    def _build_matchers(self):
+        """
+        Compile the category keywords into matchers once, at construction.
+        
+        Each category gets one compiled regex over its lowercased keywords, which
+        the rule scan tries in category order. When pyahocorasick is available an
+        automaton over all keywords is built as well, so a description is scanned
+        once regardless of how many keywords there are; otherwise a regex union
+        of all keywords skips the per-category scan for descriptions that match
+        nothing.
+        """
+        self._ac = None
+        self._keyword_union = None
+        self._compiled = [
+            (category, re.compile('|'.join(re.escape(keyword.lower()) for keyword in keywords), re.IGNORECASE))
+            for category, keywords in self.categories.items()
+            if keywords
+        ]
+        
+        keywords = [
+            (priority, category, keyword.lower())
+            for priority, (category, category_keywords) in enumerate(self.categories.items())
+            for keyword in category_keywords
+            if keyword
+        ]
+        if not keywords:
+            return
+            
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for priority, category, keyword in keywords:
+                # Keep the earliest category for keywords listed more than once
+                if automaton.get(keyword, None) is None:
+                    automaton.add_word(keyword, (priority, category))
+            automaton.make_automaton()
+            self._ac = automaton
+        else:
+            self._keyword_union = re.compile('|'.join(re.escape(keyword) for _, _, keyword in keywords), re.IGNORECASE)
+            
+    def _ensure_model(self):
+        """Load the pre-trained model the first time it could be needed."""
+        if AI_MODEL['enabled'] and not self._model_load_attempted:
+            self._model_load_attempted = True
             self._load_model()
             
     def _load_model(self):
         """Load a pre-trained categorization model if available."""
-        model_path = AI_MODEL['model_path']
+        model_path = _MODEL_PATH
         
-        if not isinstance(model_path, Path):
-            model_path = Path(model_path)
-            
         if model_path.exists():
             try:
-                self.ai_model = joblib.load(model_path)
+                # Uncompressed models can be memory-mapped so arrays page in on demand
+                self.ai_model = joblib.load(model_path, mmap_mode=None if _MODEL_COMPRESS else 'r')
                 self.model_loaded = True
                 logger.info(f"Loaded AI categorization model from {model_path}")
             except Exception as e:
@@ -61,26 +182,46 @@ class Categorizer:
             logger.warning("No AI model to save")
             return False
             
-        model_path = AI_MODEL['model_path']
-        
-        if not isinstance(model_path, Path):
-            model_path = Path(model_path)
-            
-        # Ensure directory exists
-        model_path.parent.mkdir(parents=True, exist_ok=True)
+        model_path = _MODEL_PATH
         
         try:
-            joblib.dump(self.ai_model, model_path)
+            joblib.dump(self.ai_model, model_path, compress=_MODEL_COMPRESS)
             logger.info(f"Saved AI model to {model_path}")
             return True
         except Exception as e:
             logger.error(f"Error saving AI model: {str(e)}", exc_info=True)
             return False
             
+    def clear_cache(self):
+        """Forget all memoized categorizations."""
+        self._cache.clear()
+        
+    def _remember(self, key, category):
+        """
+        Memoize a categorization, evicting the least recently used entry when full.
+        
+        Args:
+            key (tuple): Normalized description and whether the amount is non-negative
+            category (str): Category name
+            
+        Returns:
+            str: The category, for chaining into a return
+        """
+        self._cache[key] = category
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+            
+        return category
+        
     def categorize_transaction(self, description, amount=0, date=None):
         """
         Categorize a single transaction using rules or AI.
         
+        Results are memoized on the normalized description and the sign of the
+        amount, since the same merchant usually appears many times in a statement
+        but a refund from it belongs in a different category than a purchase.
+        
         Args:
             description (str): Transaction description
             amount (float, optional): Transaction amount
@@ -89,29 +230,43 @@ class Categorizer:
         Returns:
             str: Category name
         """
+        key = (description.lower().strip(), pd.isna(amount) or amount >= 0)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+            
         # Convert date to string format if it's a datetime
-        date_str = date.strftime("%Y-%m-%d") if date else datetime.now().strftime("%Y-%m-%d")
+        date_str = _format_date(date)
         
         # Try using API-based categorization first if enabled
-        if self.ai_tools.is_enabled() and AI_API['capabilities']['transaction_categorization']:
+        use_api = self.ai_tools.is_enabled() and AI_API['capabilities']['transaction_categorization']
+        if use_api:
             try:
                 result = self.ai_tools.categorize_transaction(description, amount, date_str)
                 if result and result['confidence'] >= AI_MODEL['confidence_threshold']:
                     logger.debug(f"API categorized '{description}' as '{result['category']}' with confidence {result['confidence']}")
-                    return result['category']
+                    return self._remember(key, result['category'])
             except Exception as e:
                 logger.warning(f"API categorization failed: {str(e)}")
         
         # Try using ML model if available
+        category = None
+        self._ensure_model()
         if self.model_loaded:
             try:
                 category = self._categorize_with_model(description)
-                return category
             except Exception as e:
                 logger.warning(f"ML categorization failed: {str(e)}")
         
         # Fall back to rule-based categorization
-        return self._categorize_with_rules(description)
+        if category is None:
+            category = self._categorize_with_rules(description)
+            
+        # A fallback after an unconfident API answer is retried next time
+        if use_api:
+            return category
+            
+        return self._remember(key, category)
         
     def _categorize_with_model(self, description):
         """
@@ -126,95 +281,268 @@ class Categorizer:
         if not self.model_loaded or not self.ai_model:
             return self._categorize_with_rules(description)
             
+        return self._categorize_with_model_batch(pd.Series([description]))[0]
+            
+    def _categorize_with_rules(self, description):
+        """
+        Categorize a transaction using keyword rules.
+        
+        Args:
+            description (str): Transaction description
+            
+        Returns:
+            str: Category name
+        """
+        # The automaton reports hits by position, so take the earliest category
+        if self._ac is not None:
+            best = min((match for _, match in self._ac.iter(description.lower())), default=None)
+            return best[1] if best else 'miscellaneous'
+            
+        if self._keyword_union is not None and not self._keyword_union.search(description):
+            return 'miscellaneous'
+            
+        # The patterns ignore case, so no lowercased copy is needed
+        for category, pattern in self._compiled:
+            if pattern.search(description):
+                return category
+        
+        # If no match is found
+        return 'miscellaneous'
+        
+    def _categorize_with_model_batch(self, descriptions):
+        """
+        Categorize a column of descriptions with one ML prediction call.
+        
+        When the classifier reports probabilities, rows whose top probability is
+        below AI_MODEL['confidence_threshold'] fall back to keyword rules.
+        
+        Args:
+            descriptions (pd.Series): Transaction descriptions
+            
+        Returns:
+            np.ndarray: Category name for each description
+        """
+        model = self.ai_model or {}
+        encoder = model.get('encoder')
+        
+        # Models trained before the pipeline format keep the vectorizer separate
+        pipeline = model.get('pipeline')
+        vectorizer = model.get('vectorizer')
+        classifier = pipeline if pipeline is not None else model.get('classifier')
+        
+        if classifier is None or encoder is None or (pipeline is None and vectorizer is None):
+            return self._categorize_with_rules_batch(descriptions)
+            
         try:
-            # Preprocess description
-            processed_desc = description.lower()
+            features = descriptions.fillna('').astype(str).str.lower()
+            if pipeline is None:
+                features = vectorizer.transform(features)
             
-            # Extract features (depends on how model was trained)
-            vectorizer = self.ai_model.get('vectorizer')
-            if vectorizer:
-                features = vectorizer.transform([processed_desc])
+            if not hasattr(classifier, 'predict_proba'):
+                return encoder.inverse_transform(classifier.predict(features))
                 
-                # Make prediction
-                classifier = self.ai_model.get('classifier')
-                if classifier:
-                    prediction = classifier.predict(features)[0]
-                    
-                    # Convert prediction back to category name
-                    encoder = self.ai_model.get('encoder')
-                    if encoder:
-                        category = encoder.inverse_transform([prediction])[0]
-                        return category
-            
-            # If any step fails, fall back to rules
-            return self._categorize_with_rules(description)
+            # One predict_proba call gives both the label and its confidence
+            proba = classifier.predict_proba(features)
+            categories = encoder.inverse_transform(classifier.classes_[proba.argmax(axis=1)]).astype(object)
             
+            low_confidence = proba.max(axis=1) < AI_MODEL['confidence_threshold']
+            if low_confidence.any():
+                categories[low_confidence] = self._categorize_with_rules_batch(descriptions[low_confidence])
+                
+            return categories
         except Exception as e:
             logger.warning(f"Error in ML categorization: {str(e)}")
-            return self._categorize_with_rules(description)
+            return self._categorize_with_rules_batch(descriptions)
             
-    def _categorize_with_rules(self, description):
+    def _categorize_with_rules_batch(self, descriptions):
         """
-        Categorize a transaction using keyword rules.
+        Categorize a column of descriptions using keyword rules.
+        
+        Runs one vectorized substring search per category over the whole column,
+        keeping the first matching category for each row (same result as
+        _categorize_with_rules). Large columns are matched by a multithreaded
+        numba kernel when numba is installed, otherwise split into chunks matched
+        in parallel worker processes.
         
         Args:
-            description (str): Transaction description
+            descriptions (pd.Series): Transaction descriptions
             
         Returns:
-            str: Category name
+            np.ndarray: Category name for each description
+        """
+        if _has_pyarrow:
+            texts = descriptions.astype('string[pyarrow]').fillna('')
+        else:
+            texts = descriptions.fillna('').astype(str)
+            
+        names = list(self.categories.keys())
+        cat_ids = {category: cat_id for cat_id, category in enumerate(names)}
+        patterns = [(cat_ids[category], pattern) for category, pattern in self._compiled]
+        
+        if len(texts) < _PARALLEL_RULES_MIN_ROWS:
+            codes = _rule_chunk(texts, patterns)
+        elif _has_numba:
+            codes = self._match_rules_numba(texts)
+        else:
+            bounds = np.linspace(0, len(texts), (os.cpu_count() or 1) + 1, dtype=int)
+            chunks = (texts.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:]))
+            results = joblib.Parallel(n_jobs=-1)(joblib.delayed(_rule_chunk)(chunk, patterns) for chunk in chunks)
+            codes = np.concatenate(results)
+            
+        # Unmatched rows index the trailing 'miscellaneous' entry
+        return np.array(names + ['miscellaneous'], dtype=object)[codes]
+        
+    def _match_rules_numba(self, texts):
+        """
+        Match descriptions against the keyword rules with the numba kernel.
+        
+        Args:
+            texts (pd.Series): Transaction descriptions
+            
+        Returns:
+            np.ndarray: Index of the first matching category per row, or -1
         """
-        description = description.lower()
+        from ._rules_numba import match_rules, pack_strings
         
-        # Check each category's keywords
-        for category, keywords in self.categories.items():
-            for keyword in keywords:
-                if keyword.lower() in description:
-                    return category
+        # Keywords in category order, so the kernel can stop at the first hit
+        keywords = [
+            (cat_id, keyword.lower())
+            for cat_id, category_keywords in enumerate(self.categories.values())
+            for keyword in category_keywords
+        ]
+        kw_buf, kw_off = pack_strings(keyword for _, keyword in keywords)
+        kw_cat = np.array([cat_id for cat_id, _ in keywords], dtype=np.int16)
         
-        # If no match is found
-        return 'miscellaneous'
+        desc_buf, desc_off = pack_strings(texts.str.lower())
+        codes = np.empty(len(texts), dtype=np.int16)
+        match_rules(desc_buf, desc_off, kw_buf, kw_off, kw_cat, codes)
         
-    def categorize_transactions(self, transactions_df):
+        return codes
+        
+    def _categorize_with_api_batch(self, df):
+        """
+        Categorize a DataFrame through the AI API, one request per batch of
+        distinct descriptions rather than one per row.
+        
+        Rows are deduplicated on the same description-and-sign key as the memo,
+        and keys already in the memo are not sent. Rows the API cannot
+        categorize confidently fall back to the model or rules in one batch.
+        
+        Args:
+            df (pd.DataFrame): Transactions with a 'description' column
+            
+        Returns:
+            list: Category name for each row
+        """
+        descs = df['description'].fillna('').astype(str).to_numpy()
+        amounts = df['amount'].to_numpy() if 'amount' in df.columns else np.zeros(len(df))
+        dates = df['date'].tolist() if 'date' in df.columns else [None] * len(df)
+        signs = (np.nan_to_num(np.asarray(amounts, dtype=float)) >= 0).tolist()
+        keys = [(desc.lower().strip(), sign) for desc, sign in zip(descs, signs)]
+        
+        # Resolve memoized keys up front; remember the first row of each new one
+        resolved = {}
+        pending = {}
+        for i, key in enumerate(keys):
+            if key in resolved or key in pending:
+                continue
+            if key in self._cache:
+                resolved[key] = self._cache[key]
+            else:
+                pending[key] = i
+                
+        if pending:
+            rows = list(pending.values())
+            today = datetime.now().strftime("%Y-%m-%d")
+            payload = [
+                {'description': descs[i], 'amount': float(amounts[i]), 'date': _format_date(dates[i], today)}
+                for i in rows
+            ]
+            
+            try:
+                results = self.ai_tools.categorize_many(payload)
+            except Exception as e:
+                logger.warning(f"API batch categorization failed: {str(e)}")
+                results = [None] * len(rows)
+                
+            unresolved = []
+            for i, result in zip(rows, results):
+                if result and result['confidence'] >= AI_MODEL['confidence_threshold']:
+                    resolved[keys[i]] = self._remember(keys[i], result['category'])
+                else:
+                    unresolved.append(i)
+                    
+            # Unconfident rows fall back in-process without being memoized
+            if unresolved:
+                fallback_descs = pd.Series(descs[unresolved])
+                if self.model_loaded:
+                    fallback = self._categorize_with_model_batch(fallback_descs)
+                else:
+                    fallback = self._categorize_with_rules_batch(fallback_descs)
+                    
+                resolved.update(zip((keys[i] for i in unresolved), fallback))
+                
+            logger.debug(f"API categorized {len(rows) - len(unresolved)} of {len(rows)} distinct descriptions")
+            
+        return [resolved[key] for key in keys]
+        
+    def _as_categorical(self, categories):
+        """
+        Store category names as a Categorical over the configured categories.
+        
+        Labels outside the configured set (e.g. from the AI API or a model trained
+        on other labels) are kept as extra categories rather than dropped.
+        
+        Args:
+            categories (array-like): Category name for each row
+            
+        Returns:
+            pd.Categorical: Integer-coded categories
+        """
+        known = list(dict.fromkeys(list(self.categories.keys()) + ['miscellaneous']))
+        extra = set(pd.unique(np.asarray(categories, dtype=object))) - set(known)
+        
+        # Missing labels stay NaN; categories themselves cannot be null
+        extra = sorted((label for label in extra if not pd.isna(label)), key=str)
+        
+        return pd.Categorical(categories, categories=known + extra)
+        
+    def categorize_transactions(self, transactions_df, inplace=False):
         """
         Categorize multiple transactions in a DataFrame.
         
         Args:
             transactions_df (pd.DataFrame): DataFrame with at least 'description' column
+            inplace (bool): Add the 'category' column to transactions_df itself
             
         Returns:
-            pd.DataFrame: DataFrame with added 'category' column
+            pd.DataFrame: DataFrame with added 'category' column. Unless inplace is
+                set this is a new frame that shares the input's column data
         """
         if 'description' not in transactions_df.columns:
             logger.error("Transactions DataFrame must have a 'description' column")
             return transactions_df
             
-        # Create a copy to avoid modifying the original
-        df = transactions_df.copy()
-        
-        # Get amount and date columns if they exist
-        amount_col = None
-        date_col = None
+        self._ensure_model()
         
-        if 'amount' in df.columns:
-            amount_col = 'amount'
-        
-        if 'date' in df.columns:
-            date_col = 'date'
+        # API categorization sends each distinct description once, in batches
+        if self.ai_tools.is_enabled() and AI_API['capabilities']['transaction_categorization']:
+            categories = self._categorize_with_api_batch(transactions_df)
+                
+        # Otherwise categorize the whole column at once
+        elif self.model_loaded:
+            categories = self._categorize_with_model_batch(transactions_df['description'])
+        else:
+            categories = self._categorize_with_rules_batch(transactions_df['description'])
             
-        # Apply categorization to each transaction
-        categories = []
+        categories = self._as_categorical(categories)
         
-        for _, row in df.iterrows():
-            desc = row['description']
-            amount = row[amount_col] if amount_col else 0
-            date = row[date_col] if date_col else None
-            
-            category = self.categorize_transaction(desc, amount, date)
-            categories.append(category)
+        if inplace:
+            transactions_df['category'] = categories
+            return transactions_df
             
-        df['category'] = categories
-        
-        return df
+        # assign() adds the column without deep-copying the existing ones
+        return transactions_df.assign(category=categories)
         
     def train_model(self, transactions_df, category_col='category', description_col='description'):
         """
@@ -228,51 +556,50 @@ class Categorizer:
         Returns:
             bool: True if training was successful, False otherwise
         """
-        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.feature_extraction.text import HashingVectorizer
         from sklearn.preprocessing import LabelEncoder
-        from sklearn.ensemble import RandomForestClassifier
-        from sklearn.pipeline import Pipeline
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.pipeline import make_pipeline
         
         if len(transactions_df) < AI_MODEL['min_samples']:
             logger.warning(f"Not enough samples for training (min {AI_MODEL['min_samples']} required)")
             return False
             
         try:
-            # Prepare data
-            X = transactions_df[description_col].astype(str).str.lower()
-            y = transactions_df[category_col]
-            
-            # Remove rows with missing values
-            mask = ~(X.isna() | y.isna())
-            X = X[mask]
-            y = y[mask]
+            # Drop rows with missing values before the single lowercasing pass
+            data = transactions_df[[description_col, category_col]].dropna()
+            X = data[description_col].astype(str).str.lower()
+            y = data[category_col]
             
             if len(X) < AI_MODEL['min_samples']:
                 logger.warning(f"Not enough valid samples after filtering (min {AI_MODEL['min_samples']} required)")
                 return False
                 
-            # Create feature extraction and encoding components
-            vectorizer = CountVectorizer(max_features=500, stop_words='english', ngram_range=(1, 2))
+            # Hashed features need no fitted vocabulary, and a linear model
+            # predicts with one sparse dot product instead of walking trees
+            pipeline = make_pipeline(
+                HashingVectorizer(n_features=2**18, stop_words='english', ngram_range=(1, 2), alternate_sign=False),
+                SGDClassifier(loss='log_loss', n_jobs=-1, random_state=42)
+            )
             encoder = LabelEncoder()
             
             # Fit encoder
             y_encoded = encoder.fit_transform(y)
             
-            # Create and train classifier
-            classifier = RandomForestClassifier(n_estimators=100, random_state=42)
-            
             # Fit vectorizer and classifier
-            X_features = vectorizer.fit_transform(X)
-            classifier.fit(X_features, y_encoded)
+            pipeline.fit(X, y_encoded)
             
             # Store model components
             self.ai_model = {
-                'vectorizer': vectorizer,
-                'encoder': encoder,
-                'classifier': classifier
+                'pipeline': pipeline,
+                'encoder': encoder
             }
             
             self.model_loaded = True
+            self._model_load_attempted = True
+            
+            # Memoized results came from the previous model or rules
+            self.clear_cache()
             
             # Save model
             self.save_model()
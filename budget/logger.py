@@ -14,6 +14,9 @@ def setup_logger(name='budget'):
     """
     Set up and configure the application logger.
     
+    Safe to call repeatedly: a logger that already has handlers is returned as is,
+    so importing this module under more than one name never duplicates output.
+    
     Args:
         name (str): The name of the logger
         
@@ -22,12 +25,16 @@ def setup_logger(name='budget'):
     """
     logger = logging.getLogger(name)
     
+    # Already configured
+    if logger.handlers:
+        return logger
+    
     # Set level from config
     level = getattr(logging, LOGGER['level'].upper(), logging.INFO)
     logger.setLevel(level)
     
-    # Clear any existing handlers
-    logger.handlers = []
+    # Handlers are attached here, so don't also pass records up to the root logger
+    logger.propagate = False
     
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -47,10 +54,12 @@ def setup_logger(name='budget'):
         log_dir = os.path.dirname(log_file)
         os.makedirs(log_dir, exist_ok=True)
         
+        # delay=True defers opening the log file until the first record is written
         file_handler = RotatingFileHandler(
             log_file,
             maxBytes=LOGGER['max_size'],
-            backupCount=LOGGER['backup_count']
+            backupCount=LOGGER['backup_count'],
+            delay=True
         )
         file_handler.setLevel(level)
         
@@ -70,7 +79,8 @@ def setup_logger(name='budget'):
         print(f"Warning: Could not set up file logging. Error: {e}")
         logger.addHandler(console_handler)
     
-    logger.info(f"Logger initialized with level {LOGGER['level']}")
+    # Logged at DEBUG so importing the module doesn't open the delayed log file
+    logger.debug("Logger initialized with level %s", LOGGER['level'])
     
     return logger
 
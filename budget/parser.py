@@ -1,6 +1,12 @@
 """
 Transaction parser module for importing and processing bank and credit card statements.
 """
+import codecs
+import html
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+import importlib.util
+import io
 import os
 import pandas as pd
 import numpy as np
@@ -12,6 +18,196 @@ from pathlib import Path
 from configs.config import BANK_IMPORT
 from .logger import logger
 
+# Amount patterns, compiled once at import
+_AMOUNT_CLEAN_RE = re.compile(r'[,$£€]')
+_AMOUNT_EXTRACT_RE = re.compile(r'(-?\d+\.?\d*)')
+_CURRENCY_RE = re.compile(BANK_IMPORT['amount_regex'])
+
+# Column-name patterns for finding the date, description and amount columns
+_DATE_COL_RE = re.compile(r'date')
+_DESC_COL_RE = re.compile(r'desc|payee|merchant|name|transaction')
+_AMOUNT_COL_RE = re.compile(r'amount|sum|value|debit|credit')
+
+# OFX/QFX statement transactions and the fields read from each
+_OFX_TRANSACTION_RE = re.compile(rb'<STMTTRN>(.*?)</STMTTRN>', re.S | re.I)
+_OFX_FIELD_RES = {
+    field: re.compile(rb'<' + field + rb'>([^<\r\n]*)', re.I)
+    for field in (b'DTPOSTED', b'NAME', b'PAYEE', b'TRNAMT', b'FITID')
+}
+_OFX_CHARSET_RE = re.compile(rb'CHARSET:\s*(\S+)|encoding="([^"]+)"', re.I)
+
+# Checked without importing pyarrow itself
+_has_pyarrow = importlib.util.find_spec('pyarrow') is not None
+
+# Multi-threaded pyarrow CSV reader when installed; it only handles UTF-8 input
+_CSV_ENGINE = 'pyarrow' if _has_pyarrow else 'c'
+
+# Rust-based Excel reader (python-calamine) when installed
+_EXCEL_ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') is not None else None
+
+# Descriptions are stored in one contiguous Arrow buffer rather than as Python str objects
+_TEXT_DTYPE = 'string[pyarrow]' if _has_pyarrow else 'string'
+_UTF8_ENCODINGS = ('utf-8', 'utf_8', 'utf8', 'ascii')
+
+# Byte order marks checked before falling back to encoding detection
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+def _extract_tables_from_pages(file_path, page_indexes):
+    """
+    Extract tables from a range of PDF pages.
+    
+    Defined at module level so it can run in a worker process.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        page_indexes (range): Zero-based page numbers to read
+        
+    Returns:
+        list: Tables in page order, each a list of rows
+    """
+    import pdfplumber
+    
+    tables = []
+    with pdfplumber.open(file_path) as pdf:
+        for page_index in page_indexes:
+            tables.extend(pdf.pages[page_index].extract_tables())
+    return tables
+
+def _parse_ofx_transactions(data):
+    """
+    Read the transactions of an OFX/QFX statement with a single regex pass, without building a document tree.
+    
+    Args:
+        data (bytes): Raw OFX/QFX file contents
+        
+    Returns:
+        pd.DataFrame: Transactions with date, description, amount and transaction_id columns,
+            or None if the file contains no transactions
+            
+    Raises:
+        ValueError: If a transaction amount is not a number (e.g. a comma decimal), so the caller can use ofxparse
+    """
+    # SGML headers give a Windows code page number (e.g. 1252), XML headers an encoding name
+    match = _OFX_CHARSET_RE.search(data, 0, 1024)
+    charset = (match.group(1) or match.group(2)).decode('ascii') if match else 'utf-8'
+    if charset.isdigit():
+        charset = f"cp{charset}"
+    elif charset.upper() in ('NONE', 'USASCII'):
+        charset = 'utf-8'
+        
+    dates, descriptions, amounts, ids = [], [], [], []
+    for transaction in _OFX_TRANSACTION_RE.finditer(data):
+        block = transaction.group(1)
+        fields = {}
+        for field, pattern in _OFX_FIELD_RES.items():
+            found = pattern.search(block)
+            fields[field] = found.group(1).strip() if found else b''
+            
+        dates.append(fields[b'DTPOSTED'][:8].decode('ascii', 'ignore'))
+        # Text fields keep SGML entities such as &amp; that ofxparse would have decoded
+        descriptions.append(html.unescape((fields[b'NAME'] or fields[b'PAYEE']).decode(charset, 'replace')))
+        amounts.append(float(fields[b'TRNAMT']))
+        ids.append(html.unescape(fields[b'FITID'].decode(charset, 'replace')))
+        
+    if not dates:
+        return None
+        
+    df = pd.DataFrame({
+        'date': pd.to_datetime(dates, format='%Y%m%d', errors='coerce'),
+        'description': descriptions,
+        'amount': np.asarray(amounts, dtype=np.float64),
+        'transaction_id': ids
+    })
+    
+    # Drop unparseable dates and amounts, as _standardize_columns does for the other formats
+    return df.dropna(subset=['date', 'amount'], ignore_index=True)
+
+@lru_cache(maxsize=256)
+def _detect_encoding_cached(file_path, size, mtime_ns):
+    """
+    Detect a file's encoding; cached per file path, size and modification time.
+    
+    Byte order marks and plain UTF-8 are recognized directly; a statistical
+    detector is only run for files that are neither.
+    
+    Args:
+        file_path (str): Path to the file
+        size (int): File size in bytes (cache key only)
+        mtime_ns (int): File modification time in nanoseconds (cache key only)
+        
+    Returns:
+        str: Detected encoding
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            sample = f.read(4096)
+    except Exception:
+        return BANK_IMPORT['default_encoding']
+        
+    # Byte order marks (UTF-32 first, since its little-endian BOM starts like UTF-16's)
+    for bom, encoding in _BOM_ENCODINGS:
+        if sample.startswith(bom):
+            logger.debug(f"Detected encoding from BOM: {encoding}")
+            return encoding
+            
+    # Most statements are UTF-8; allow a multi-byte character cut off at the end of the sample
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+        
+    try:
+        try:
+            from charset_normalizer import detect
+        except ImportError:
+            from chardet import detect
+            
+        encoding = detect(sample)['encoding'] or BANK_IMPORT['default_encoding']
+        logger.debug(f"Detected encoding: {encoding}")
+        return encoding
+        
+    except ImportError:
+        logger.warning("chardet not installed. Using default encoding. Install with: pip install chardet")
+        return BANK_IMPORT['default_encoding']
+    except Exception:
+        return BANK_IMPORT['default_encoding']
+
+@lru_cache(maxsize=256)
+def _detect_delimiter_cached(file_path, size, mtime_ns, encoding):
+    """
+    Detect a CSV file's delimiter; cached per file path, size, modification time and encoding.
+    
+    Args:
+        file_path (str): Path to the CSV file
+        size (int): File size in bytes (cache key only)
+        mtime_ns (int): File modification time in nanoseconds (cache key only)
+        encoding (str): File encoding
+        
+    Returns:
+        str: Detected delimiter
+    """
+    try:
+        with open(file_path, 'r', encoding=encoding) as f:
+            sample = f.read(1000)
+            
+        sniffer = csv.Sniffer()
+        dialect = sniffer.sniff(sample)
+        delimiter = dialect.delimiter
+        
+        logger.debug(f"Detected delimiter: {delimiter}")
+        return delimiter
+        
+    except Exception:
+        # Default to comma if detection fails
+        return ','
+
 class TransactionParser:
     """
     Parser for bank and credit card transaction data from various file formats.
@@ -19,16 +215,43 @@ class TransactionParser:
     
     def __init__(self):
         """Initialize the transaction parser."""
-        self.transactions = pd.DataFrame()
+        # Imported frames are concatenated once, on first access to self.transactions
+        self._frames = []
+        self._combined = None
         self.source_files = []
         
-    def import_file(self, file_path, source_name=None):
+    @property
+    def transactions(self):
+        """pd.DataFrame: All imported transactions, sorted by date."""
+        if self._combined is None:
+            if len(self._frames) > 1:
+                combined = pd.concat(self._frames, ignore_index=True, copy=False)
+                
+                # Frames from different sources have different categories, which concat turns into object
+                if 'source' in combined and not isinstance(combined['source'].dtype, pd.CategoricalDtype):
+                    combined['source'] = combined['source'].astype('category')
+                self._frames = [combined]
+                
+            # Keep the frame date-sorted so date ranges can be sliced with a binary search
+            if self._frames and 'date' in self._frames[0] and not self._frames[0]['date'].is_monotonic_increasing:
+                self._frames = [self._frames[0].sort_values('date', kind='mergesort', ignore_index=True)]
+            self._combined = self._frames[0] if self._frames else pd.DataFrame()
+        return self._combined
+        
+    @transactions.setter
+    def transactions(self, df):
+        self._frames = [df]
+        self._combined = None
+        
+    def import_file(self, file_path, source_name=None, num_workers=None):
         """
         Import a transaction file in various formats (CSV, Excel, etc.)
         
         Args:
             file_path (str): Path to the file to import
             source_name (str, optional): Name of the source (e.g., "Chase Credit Card")
+            num_workers (int, optional): Worker processes for PDF table extraction
+                (defaults to the CPU count, at most 4)
         
         Returns:
             bool: True if import was successful, False otherwise
@@ -55,7 +278,7 @@ class TransactionParser:
             elif extension == '.qfx' or extension == '.ofx':
                 df = self._import_ofx(file_path)
             elif extension == '.pdf':
-                df = self._import_pdf(file_path)
+                df = self._import_pdf(file_path, num_workers)
             else:
                 logger.error(f"Unsupported file format: {extension}")
                 return False
@@ -64,13 +287,16 @@ class TransactionParser:
                 logger.error(f"No transactions found in {file_path}")
                 return False
                 
-            # Add source information
-            df['source'] = source_name
+            df['description'] = df['description'].astype(_TEXT_DTYPE)
+            
+            # Add source information (categorical: one code per row instead of a string)
+            df['source'] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=[source_name])
             df['import_date'] = datetime.now()
             df['file_path'] = str(file_path)
             
-            # Add to master transactions DataFrame
-            self.transactions = pd.concat([self.transactions, df], ignore_index=True)
+            # Queue for the master transactions DataFrame
+            self._frames.append(df)
+            self._combined = None
             self.source_files.append(str(file_path))
             
             logger.info(f"Successfully imported {len(df)} transactions from {file_path}")
@@ -95,8 +321,16 @@ class TransactionParser:
             encoding = self._detect_encoding(file_path)
             delimiter = self._detect_delimiter(file_path, encoding)
             
-            # Read CSV file
-            df = pd.read_csv(file_path, delimiter=delimiter, encoding=encoding, error_bad_lines=False)
+            # Read CSV file, skipping malformed lines
+            engine = _CSV_ENGINE if (encoding or '').lower() in _UTF8_ENCODINGS else 'c'
+            try:
+                df = pd.read_csv(file_path, delimiter=delimiter, encoding=encoding,
+                                 on_bad_lines='skip', engine=engine)
+            except Exception as e:
+                if engine == 'c':
+                    raise
+                logger.debug(f"pyarrow CSV reader failed ({e}), retrying with the C reader")
+                df = pd.read_csv(file_path, delimiter=delimiter, encoding=encoding, on_bad_lines='skip')
             
             # Try to identify the date, description, and amount columns
             return self._standardize_columns(df)
@@ -116,8 +350,9 @@ class TransactionParser:
             pd.DataFrame: DataFrame with standardized transaction data
         """
         try:
-            # Read Excel file
-            df = pd.read_excel(file_path)
+            # Read Excel file; legacy .xls stays on pandas' default (xlrd) reader
+            engine = _EXCEL_ENGINE if Path(file_path).suffix.lower() == '.xlsx' else None
+            df = pd.read_excel(file_path, engine=engine)
             
             # Try to identify the date, description, and amount columns
             return self._standardize_columns(df)
@@ -137,27 +372,40 @@ class TransactionParser:
             pd.DataFrame: DataFrame with standardized transaction data
         """
         try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+                
+            # Fast path: only four fields per transaction are needed
+            try:
+                df = _parse_ofx_transactions(data)
+                if df is not None:
+                    return df
+            except (ValueError, LookupError) as e:
+                logger.debug(f"Falling back to ofxparse for {file_path}: {str(e)}")
+                
             # This requires the ofxparse library
             import ofxparse
             
-            with open(file_path, 'rb') as f:
-                ofx = ofxparse.OfxParser.parse(f)
+            ofx = ofxparse.OfxParser.parse(io.BytesIO(data))
                 
             # Extract account information
             account = ofx.account
             
-            # Extract transactions
-            transactions = []
-            for transaction in account.statement.transactions:
-                transactions.append({
-                    'date': transaction.date,
-                    'description': transaction.payee,
-                    'amount': float(transaction.amount),
-                    'transaction_id': transaction.id
-                })
+            # Extract transactions column by column
+            transactions = account.statement.transactions
+            dates = [transaction.date for transaction in transactions]
+            descriptions = [transaction.payee for transaction in transactions]
+            amounts = np.fromiter((transaction.amount for transaction in transactions),
+                                  dtype=np.float64, count=len(transactions))
+            ids = [transaction.id for transaction in transactions]
                 
             # Create DataFrame
-            df = pd.DataFrame(transactions)
+            df = pd.DataFrame({
+                'date': dates,
+                'description': descriptions,
+                'amount': amounts,
+                'transaction_id': ids
+            })
             
             return df
             
@@ -168,13 +416,14 @@ class TransactionParser:
             logger.error(f"Error importing OFX/QFX {file_path}: {str(e)}", exc_info=True)
             return None
     
-    def _import_pdf(self, file_path):
+    def _import_pdf(self, file_path, num_workers=None):
         """
         Import transactions from a PDF file.
         This is more complex and may require additional libraries like pdfplumber or tabula-py.
         
         Args:
             file_path (Path): Path to the PDF file
+            num_workers (int, optional): Worker processes for table extraction
             
         Returns:
             pd.DataFrame: DataFrame with standardized transaction data
@@ -186,31 +435,41 @@ class TransactionParser:
             try:
                 import pdfplumber
                 
-                transactions = []
                 with pdfplumber.open(file_path) as pdf:
-                    for page in pdf.pages:
-                        # Extract tables from the page
-                        tables = page.extract_tables()
+                    n_pages = len(pdf.pages)
+                    
+                # Extract tables from contiguous page ranges in parallel
+                workers = max(1, min(num_workers or min(os.cpu_count() or 1, 4), n_pages))
+                chunk_size = max(1, -(-n_pages // workers))
+                page_ranges = [
+                    range(start, min(start + chunk_size, n_pages))
+                    for start in range(0, n_pages, chunk_size)
+                ]
+                extract = partial(_extract_tables_from_pages, str(file_path))
+                
+                if workers > 1:
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        tables = [table for chunk in executor.map(extract, page_ranges) for table in chunk]
+                else:
+                    tables = [table for chunk in map(extract, page_ranges) for table in chunk]
+                    
+                transactions = []
+                for table in tables:
+                    # Process each table
+                    if table and len(table) > 1:  # Ensure table has content
+                        # Try to identify header row
+                        header = [str(col).lower() for col in table[0]]
                         
-                        for table in tables:
-                            # Process each table
-                            if table and len(table) > 1:  # Ensure table has content
-                                # Try to identify header row
-                                header = table[0]
-                                
-                                # Check if this looks like a transaction table
-                                if any('date' in str(col).lower() for col in header) and \
-                                   any('amount' in str(col).lower() for col in header or \
-                                       'transaction' in str(col).lower() for col in header):
-                                    
-                                    # Process data rows
-                                    for row in table[1:]:
-                                        # Try to extract date, description, and amount
-                                        transactions.append(row)
+                        # Check if this looks like a transaction table
+                        if any('date' in col for col in header) and \
+                           any('amount' in col or 'transaction' in col for col in header):
+                            
+                            # Keep the header so the columns can be identified by name
+                            transactions.append(pd.DataFrame(table[1:], columns=header))
                 
                 # If we found transactions, convert to DataFrame
                 if transactions:
-                    df = pd.DataFrame(transactions)
+                    df = pd.concat(transactions, ignore_index=True)
                     return self._standardize_columns(df)
                 
             except ImportError:
@@ -249,20 +508,10 @@ class TransactionParser:
             str: Detected encoding
         """
         try:
-            import chardet
-            
-            with open(file_path, 'rb') as f:
-                result = chardet.detect(f.read(1000))
-            
-            encoding = result['encoding']
-            logger.debug(f"Detected encoding: {encoding}")
-            return encoding
-            
-        except ImportError:
-            logger.warning("chardet not installed. Using default encoding. Install with: pip install chardet")
-            return BANK_IMPORT['default_encoding']
-        except Exception:
+            stat = os.stat(file_path)
+        except OSError:
             return BANK_IMPORT['default_encoding']
+        return _detect_encoding_cached(str(file_path), stat.st_size, stat.st_mtime_ns)
     
     def _detect_delimiter(self, file_path, encoding):
         """
@@ -276,19 +525,10 @@ class TransactionParser:
             str: Detected delimiter
         """
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                sample = f.read(1000)
-                
-            sniffer = csv.Sniffer()
-            dialect = sniffer.sniff(sample)
-            delimiter = dialect.delimiter
-            
-            logger.debug(f"Detected delimiter: {delimiter}")
-            return delimiter
-            
-        except Exception:
-            # Default to comma if detection fails
+            stat = os.stat(file_path)
+        except OSError:
             return ','
+        return _detect_delimiter_cached(str(file_path), stat.st_size, stat.st_mtime_ns, encoding)
     
     def _standardize_columns(self, df):
         """
@@ -301,38 +541,31 @@ class TransactionParser:
             pd.DataFrame: Standardized transaction DataFrame
         """
         # Make column names lowercase for easier matching
-        df.columns = df.columns.str.lower()
+        df.columns = [str(col).lower() for col in df.columns]
         
-        # Try to identify date column
-        date_col = None
+        # Identify the date, description/payee/merchant and amount columns in one pass;
+        # each column fills at most one role, first match wins
+        date_col = desc_col = amount_col = None
         for col in df.columns:
-            if 'date' in col.lower():
+            if date_col is None and _DATE_COL_RE.search(col):
                 date_col = col
-                break
-                
-        # Try to identify description/payee/merchant column
-        desc_col = None
-        for col in df.columns:
-            if any(term in col.lower() for term in ['desc', 'payee', 'merchant', 'name', 'transaction']):
+            elif desc_col is None and _DESC_COL_RE.search(col):
                 desc_col = col
-                break
-                
-        # Try to identify amount column
-        amount_col = None
-        for col in df.columns:
-            if any(term in col.lower() for term in ['amount', 'sum', 'value', 'transaction', 'debit', 'credit']):
+            elif amount_col is None and _AMOUNT_COL_RE.search(col):
                 amount_col = col
-                break
                 
         # If we couldn't identify all required columns, try to be smart
         if not all([date_col, desc_col, amount_col]):
+            # The leading rows are enough to tell what a column holds
+            rows = df.head(BANK_IMPORT.get('inference_sample_size', 1000))
+            
             # Look at the data types
-            for col in df.columns:
+            for col in rows.columns:
                 # Check if column contains dates
-                if not date_col and df[col].dtype == 'object':
+                if not date_col and rows[col].dtype == 'object':
                     try:
                         # Try to parse a sample as date
-                        sample = df[col].dropna().iloc[0] if not df[col].dropna().empty else None
+                        sample = rows[col].dropna().iloc[0] if not rows[col].dropna().empty else None
                         if sample and self._is_date(sample):
                             date_col = col
                             continue
@@ -340,12 +573,13 @@ class TransactionParser:
                         pass
                         
                 # Check if column contains numeric values (could be amount)
-                if not amount_col and df[col].dtype in ['float64', 'int64'] or (df[col].dtype == 'object' and self._contains_currency(df[col])):
+                if not amount_col and (rows[col].dtype in ['float64', 'int64'] or
+                                       (rows[col].dtype == 'object' and self._contains_currency(rows[col]))):
                     amount_col = col
                     continue
                     
                 # If we still don't have a description, use the first text column that's not a date
-                if not desc_col and df[col].dtype == 'object' and col != date_col:
+                if not desc_col and rows[col].dtype == 'object' and col != date_col:
                     desc_col = col
         
         # If we still couldn't identify all required columns, return None
@@ -364,13 +598,20 @@ class TransactionParser:
         # Convert date to datetime
         standardized['date'] = self._parse_dates(standardized['date'])
         
+        # Mixed UTC offsets parse to an object column; normalize so the .dt accessors below stay vectorized
+        if not pd.api.types.is_datetime64_any_dtype(standardized['date']):
+            standardized['date'] = pd.to_datetime(standardized['date'], errors='coerce', utc=True).dt.tz_localize(None)
+        
         # Ensure amount is numeric
         standardized['amount'] = self._parse_amounts(standardized['amount'])
         
-        # Add transaction_id column
-        standardized['transaction_id'] = standardized.apply(
-            lambda row: f"{row['date'].strftime('%Y%m%d')}-{hash(row['description']) % 10000:04d}-{abs(hash(str(row['amount']))) % 10000:04d}",
-            axis=1
+        # Add transaction_id column: date plus 4-digit hashes of description and amount
+        date_part = standardized['date'].dt.strftime('%Y%m%d')
+        desc_hash = pd.util.hash_pandas_object(standardized['description'], index=False) % 10000
+        amount_hash = pd.util.hash_pandas_object(standardized['amount'].astype(str), index=False) % 10000
+        standardized['transaction_id'] = date_part.str.cat(
+            [desc_hash.astype(str).str.zfill(4), amount_hash.astype(str).str.zfill(4)],
+            sep='-'
         )
         
         # Drop rows with missing values
@@ -402,8 +643,7 @@ class TransactionParser:
         sample = series.dropna().head(5).astype(str)
         
         # Check if they match currency pattern
-        pattern = BANK_IMPORT['amount_regex']
-        matches = sample.str.contains(pattern, regex=True)
+        matches = sample.str.contains(_CURRENCY_RE, regex=True)
         
         return matches.any()
     
@@ -419,28 +659,21 @@ class TransactionParser:
         """
         # Try pandas built-in parsing first
         try:
-            return pd.to_datetime(date_series, errors='coerce')
-        except:
-            pass
+            parsed = pd.to_datetime(date_series, errors='coerce')
+        except Exception:
+            parsed = pd.Series(pd.NaT, index=date_series.index, dtype='datetime64[ns]')
             
-        # Try manual parsing with configured formats
-        results = pd.Series([None] * len(date_series), index=date_series.index)
-        
-        for i, value in enumerate(date_series):
-            if pd.isna(value):
-                continue
+        # Fill values pandas could not infer, one configured format at a time
+        remaining = parsed.isna() & date_series.notna()
+        for date_format in BANK_IMPORT['date_formats']:
+            if not remaining.any():
+                break
                 
-            # Try each date format
-            for date_format in BANK_IMPORT['date_formats']:
-                try:
-                    if isinstance(value, str):
-                        dt = datetime.strptime(value, date_format)
-                        results.iloc[i] = dt
-                        break
-                except ValueError:
-                    continue
-        
-        return pd.to_datetime(results, errors='coerce')
+            attempt = pd.to_datetime(date_series[remaining].astype(str), format=date_format, errors='coerce')
+            parsed = parsed.fillna(attempt)
+            remaining = parsed.isna() & date_series.notna()
+            
+        return parsed
     
     def _parse_amounts(self, amount_series):
         """
@@ -456,52 +689,41 @@ class TransactionParser:
         if amount_series.dtype in ['float64', 'int64']:
             return amount_series
             
-        # Convert to string first
-        amount_series = amount_series.astype(str)
-        
-        # Function to parse individual amount strings
-        def parse_amount(amount_str):
-            if pd.isna(amount_str):
-                return np.nan
-                
-            # Remove currency symbols and commas
-            amount_str = re.sub(r'[,$£€]', '', str(amount_str))
-            
-            # Handle credits/debits notation
-            if 'cr' in amount_str.lower():
-                amount_str = amount_str.lower().replace('cr', '').strip()
-                modifier = 1
-            elif 'dr' in amount_str.lower():
-                amount_str = amount_str.lower().replace('dr', '').strip()
-                modifier = -1
-            elif amount_str.startswith('(') and amount_str.endswith(')'):
-                # Parentheses often indicate negative numbers
-                amount_str = amount_str[1:-1].strip()
-                modifier = -1
-            elif amount_str.startswith('-'):
-                modifier = 1  # Already negative
-            else:
-                modifier = 1
-                
-            # Extract numeric value
-            match = re.search(r'-?\d+\.?\d*', amount_str)
-            if match:
-                try:
-                    return float(match.group(0)) * modifier
-                except ValueError:
-                    return np.nan
+        # Plain numeric strings convert directly in C; only the rest go through the regex passes
+        parsed = pd.to_numeric(amount_series, errors='coerce')
+        failed = parsed.isna() & amount_series.notna()
+        if failed.any():
+            parsed = parsed.fillna(self._parse_amount_strings(amount_series[failed]))
             
-            return np.nan
-        
-        # Apply parsing function
-        parsed = amount_series.apply(parse_amount)
-        
         # Handle positive/negative based on configuration
         if not BANK_IMPORT['positive_is_income']:
             parsed = -parsed
             
         return parsed
     
+    def _parse_amount_strings(self, amount_series):
+        """
+        Parse formatted amount strings (currency symbols, separators, CR/DR, parentheses).
+        
+        Args:
+            amount_series (pd.Series): Series of amount values
+            
+        Returns:
+            pd.Series: Series of numeric values
+        """
+        # Convert to string first, then drop currency symbols and thousands separators
+        cleaned = amount_series.astype(str).str.strip().str.replace(_AMOUNT_CLEAN_RE, '', regex=True)
+        lowered = cleaned.str.lower()
+        
+        # Handle credits/debits notation; parentheses often indicate negative numbers
+        is_credit = lowered.str.contains('cr', regex=False)
+        is_debit = ~is_credit & lowered.str.contains('dr', regex=False)
+        is_paren = ~is_credit & ~is_debit & cleaned.str.startswith('(') & cleaned.str.endswith(')')
+        modifier = np.where(is_debit | is_paren, -1.0, 1.0)
+        
+        # Extract numeric value
+        return lowered.str.extract(_AMOUNT_EXTRACT_RE, expand=False).astype('float64') * modifier
+    
     def get_transactions(self, start_date=None, end_date=None, source=None):
         """
         Get transactions filtered by date range and/or source.
@@ -517,31 +739,32 @@ class TransactionParser:
         if self.transactions.empty:
             return pd.DataFrame()
             
-        # Apply date filters
-        filtered = self.transactions.copy()
+        # Apply date filters as a slice of the date-sorted transactions
+        transactions = self.transactions
+        dates = transactions['date'].to_numpy()
+        lo = np.searchsorted(dates, pd.to_datetime(start_date).to_datetime64()) if start_date else 0
+        hi = np.searchsorted(dates, pd.to_datetime(end_date).to_datetime64(), side='right') if end_date else len(dates)
         
-        if start_date:
-            if isinstance(start_date, str):
-                start_date = pd.to_datetime(start_date)
-            filtered = filtered[filtered['date'] >= start_date]
-            
-        if end_date:
-            if isinstance(end_date, str):
-                end_date = pd.to_datetime(end_date)
-            filtered = filtered[filtered['date'] <= end_date]
+        # Missing dates sort to the end and are never inside the range
+        hi = min(hi, len(dates) - int(transactions['date'].isna().sum()))
+        filtered = transactions.iloc[lo:hi]
             
-        # Apply source filter
+        # Apply source filter; boolean indexing already returns a copy
         if source:
-            filtered = filtered[filtered['source'] == source]
+            return filtered[filtered['source'] == source]
             
-        return filtered.sort_values('date')
+        # Copy only the selected rows so callers can't modify self.transactions through the slice
+        return filtered.copy()
     
     def export_transactions(self, file_path):
         """
-        Export transactions to a CSV file.
+        Export transactions to a Parquet or CSV file.
+        
+        Files with a .parquet extension are written as zstd-compressed Parquet;
+        anything else is written as CSV.
         
         Args:
-            file_path (str): Path to save the CSV file
+            file_path (str): Path to save the file
             
         Returns:
             bool: True if export was successful, False otherwise
@@ -551,7 +774,10 @@ class TransactionParser:
             return False
             
         try:
-            self.transactions.to_csv(file_path, index=False)
+            if Path(file_path).suffix.lower() == '.parquet':
+                self.transactions.to_parquet(file_path, engine='pyarrow', compression='zstd', index=False)
+            else:
+                self.transactions.to_csv(file_path, index=False)
             logger.info(f"Exported {len(self.transactions)} transactions to {file_path}")
             return True
         except Exception as e:
@@ -571,12 +797,11 @@ class TransactionParser:
         # Count before deduplication
         count_before = len(self.transactions)
         
-        # Remove duplicates
-        self.transactions.drop_duplicates(
-            subset=['date', 'description', 'amount'],
-            keep='first',
-            inplace=True
-        )
+        # Remove duplicates, comparing one 64-bit fingerprint per row instead of tuples of objects
+        fingerprint = pd.util.hash_pandas_object(self.transactions[['date', 'description', 'amount']], index=False)
+        keep = ~fingerprint.duplicated(keep='first').to_numpy()
+        if not keep.all():
+            self.transactions = self.transactions[keep].reset_index(drop=True)
         
         # Count after deduplication
         count_after = len(self.transactions)
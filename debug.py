@@ -6,6 +6,7 @@ Helps identify import or configuration issues before running the main applicatio
 import os
 import sys
 import importlib
+import importlib.util
 import inspect
 import traceback
 
@@ -14,8 +15,30 @@ project_root = os.path.abspath(os.path.dirname(__file__))
 sys.path.insert(0, project_root)
 sys.path.insert(0, os.path.join(project_root, 'configs'))
 
-def check_module(module_name):
-    """Try to import a module and report its status."""
+def locate_module(module_name):
+    """Check that a module can be found, without executing it."""
+    for name in (module_name, f'budget.{module_name}'):
+        try:
+            if importlib.util.find_spec(name) is not None:
+                print(f"✅ Found {name}")
+                return True
+        except (ImportError, ValueError):
+            continue
+            
+    print(f"❌ Could not find {module_name}")
+    return False
+
+def check_module(module_name, verbose=False):
+    """
+    Check that a module is available and report its status.
+    
+    By default the module is only located via importlib.util.find_spec, which
+    does not execute it. With verbose=True it is imported, which also catches
+    errors raised at import time and lists the module's classes.
+    """
+    if not verbose:
+        return locate_module(module_name)
+        
     try:
         # Try importing from configs first
         module = importlib.import_module(module_name)
@@ -139,15 +162,16 @@ def main():
     for path in sys.path:
         print(path)
     
-    # Check if budget package is importable
+    # Check if budget package is importable (--verbose imports each module)
+    verbose = '--verbose' in sys.argv[1:]
     print("\n🧪 Testing imports:")
     modules_ok = True
-    modules_ok &= check_module('budget')
+    modules_ok &= check_module('budget', verbose)
     #modules_ok &= check_module('config')
-    modules_ok &= check_module('logger')
-    modules_ok &= check_module('parser')
-    modules_ok &= check_module('categorize')
-    modules_ok &= check_module('ai_tools')
+    modules_ok &= check_module('logger', verbose)
+    modules_ok &= check_module('parser', verbose)
+    modules_ok &= check_module('categorize', verbose)
+    modules_ok &= check_module('ai_tools', verbose)
     
     # Check directories
     print("\n🧪 Testing directories:")
@@ -162,7 +186,7 @@ def main():
     # Summary
     print("\n📊 Diagnostic Summary:")
     if modules_ok:
-        print("✅ All modules imported successfully")
+        print("✅ All modules imported successfully" if verbose else "✅ All modules found")
     else:
         print("❌ Some modules failed to import")
     
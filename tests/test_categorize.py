@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from budget import categorize
+from budget.categorize import Categorizer, _rule_chunk
+
+CATEGORIES = {
+    'groceries': ['whole foods', 'trader joe'],
+    'dining': ['café', 'restaurant', 'joe'],
+    'transport': ['uber', 'shell'],
+    'empty': [],
+}
+
+DESCRIPTIONS = [
+    'WHOLE FOODS MARKET #123',
+    "Trader Joe's",
+    'Joe Coffee',
+    'CAFÉ ROUGE',
+    'Uber *Trip',
+    'SHELL OIL 5544',
+    'Unknown merchant',
+    '',
+    None,
+]
+
+
+@pytest.fixture
+def categorizer():
+    return Categorizer(CATEGORIES)
+
+
+@pytest.fixture
+def descriptions():
+    # Enough rows to take the parallel path in _categorize_with_rules_batch
+    repeats = categorize._PARALLEL_RULES_MIN_ROWS // len(DESCRIPTIONS) + 1
+    return pd.Series(DESCRIPTIONS * repeats, dtype=object)
+
+
+def _expected(categorizer, descriptions):
+    return [categorizer._categorize_with_rules(desc or '') for desc in descriptions]
+
+
+def _patterns(categorizer):
+    cat_ids = {category: cat_id for cat_id, category in enumerate(categorizer.categories)}
+    return [(cat_ids[category], pattern) for category, pattern in categorizer._compiled]
+
+
+def test_rule_chunk_matches_single_rules(categorizer):
+    texts = pd.Series(DESCRIPTIONS, dtype=object).fillna('').astype(str)
+    names = np.array(list(CATEGORIES) + ['miscellaneous'], dtype=object)
+
+    codes = _rule_chunk(texts, _patterns(categorizer))
+
+    assert names[codes].tolist() == _expected(categorizer, DESCRIPTIONS)
+
+
+def test_rules_batch_numba_matches_rule_chunk(categorizer, descriptions):
+    pytest.importorskip('numba')
+    texts = descriptions.fillna('').astype(str)
+
+    codes = categorizer._match_rules_numba(texts)
+
+    np.testing.assert_array_equal(codes, _rule_chunk(texts, _patterns(categorizer)))
+
+
+def test_rules_batch_joblib_matches_single_rules(categorizer, descriptions, monkeypatch):
+    monkeypatch.setattr(categorize, '_has_numba', False)
+
+    result = categorizer._categorize_with_rules_batch(descriptions)
+
+    assert result.tolist() == _expected(categorizer, descriptions)
+
+
+def test_rules_batch_small_matches_single_rules(categorizer):
+    result = categorizer._categorize_with_rules_batch(pd.Series(DESCRIPTIONS, dtype=object))
+
+    assert result.tolist() == _expected(categorizer, DESCRIPTIONS)
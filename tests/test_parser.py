@@ -0,0 +1,137 @@
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from budget import parser
+from budget.parser import TransactionParser, _parse_ofx_transactions
+
+OFX_TEMPLATE = b"""OFXHEADER:100
+DATA:OFXSGML
+VERSION:102
+CHARSET:1252
+
+<OFX>
+<BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240105120000
+<TRNAMT>%(first)s
+<FITID>A&amp;1
+<NAME>AT&amp;T WIRELESS
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20240110
+<TRNAMT>1500.00
+<FITID>A2
+<PAYEE>ACME PAYROLL
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1>
+</OFX>
+"""
+
+
+def _ofx(first_amount=b'-45.67'):
+    return OFX_TEMPLATE % {b'first': first_amount}
+
+
+def test_parse_ofx_transactions_reads_fields():
+    df = _parse_ofx_transactions(_ofx())
+
+    assert list(df.columns) == ['date', 'description', 'amount', 'transaction_id']
+    assert df['date'].tolist() == [pd.Timestamp('2024-01-05'), pd.Timestamp('2024-01-10')]
+    assert df['amount'].dtype == np.float64
+    assert df['amount'].tolist() == [-45.67, 1500.0]
+    assert df['description'].tolist()[1] == 'ACME PAYROLL'
+
+
+def test_parse_ofx_transactions_decodes_entities():
+    df = _parse_ofx_transactions(_ofx())
+
+    assert df['description'].iloc[0] == 'AT&T WIRELESS'
+    assert df['transaction_id'].iloc[0] == 'A&1'
+
+
+def test_parse_ofx_transactions_without_transactions():
+    assert _parse_ofx_transactions(b'<OFX></OFX>') is None
+
+
+def test_parse_ofx_transactions_rejects_comma_decimal():
+    with pytest.raises(ValueError):
+        _parse_ofx_transactions(_ofx(b'-45,67'))
+
+
+def test_import_ofx_falls_back_to_ofxparse_on_comma_decimal(tmp_path, monkeypatch):
+    path = tmp_path / 'statement.ofx'
+    path.write_bytes(_ofx(b'-45,67'))
+
+    # Stand-in for ofxparse that records the fallback
+    calls = []
+    transaction = types.SimpleNamespace(date=pd.Timestamp('2024-01-05'), payee='AT&T WIRELESS',
+                                        amount=-45.67, id='A&1')
+
+    def parse(stream):
+        calls.append(stream.read())
+        statement = types.SimpleNamespace(transactions=[transaction])
+        return types.SimpleNamespace(account=types.SimpleNamespace(statement=statement))
+
+    fake = types.ModuleType('ofxparse')
+    fake.OfxParser = types.SimpleNamespace(parse=parse)
+    monkeypatch.setitem(sys.modules, 'ofxparse', fake)
+
+    df = TransactionParser()._import_ofx(path)
+
+    assert calls == [path.read_bytes()]
+    assert df['amount'].tolist() == [-45.67]
+    assert df['description'].tolist() == ['AT&T WIRELESS']
+
+
+@pytest.fixture
+def positive_is_income(monkeypatch):
+    monkeypatch.setitem(parser.BANK_IMPORT, 'positive_is_income', True)
+
+
+def test_parse_amounts_returns_numeric_series_unchanged(positive_is_income):
+    amounts = pd.Series([1.5, -2.25])
+
+    assert TransactionParser()._parse_amounts(amounts) is amounts
+
+
+def test_parse_amounts_mixes_plain_and_formatted_strings(positive_is_income):
+    amounts = pd.Series(['12.50', '$1,234.56', '(7.00)', '5.00 DR', '3.00 CR', '-4', None])
+
+    parsed = TransactionParser()._parse_amounts(amounts)
+
+    expected = pd.Series([12.5, 1234.56, -7.0, -5.0, 3.0, -4.0, np.nan])
+    pd.testing.assert_series_equal(parsed, expected, check_dtype=False)
+
+
+def test_parse_amounts_flips_sign_when_positive_is_expense(monkeypatch):
+    monkeypatch.setitem(parser.BANK_IMPORT, 'positive_is_income', False)
+
+    parsed = TransactionParser()._parse_amounts(pd.Series(['10', '(2.50)']))
+
+    assert parsed.tolist() == [-10.0, 2.5]
+
+
+def test_parse_ofx_transactions_drops_unparseable_dates():
+    df = _parse_ofx_transactions(_ofx().replace(b'20240110', b'BADDATE1'))
+
+    assert df['transaction_id'].tolist() == ['A&1']
+    assert df.index.tolist() == [0]
+
+
+def test_get_transactions_start_only_excludes_missing_dates():
+    transaction_parser = TransactionParser()
+    transaction_parser.transactions = pd.DataFrame({
+        'date': pd.to_datetime(['2024-01-03', None, '2024-01-01', '2024-02-01']),
+        'description': ['b', 'missing', 'a', 'c'],
+        'amount': [1.0, 2.0, 3.0, 4.0],
+    })
+
+    filtered = transaction_parser.get_transactions(start_date='2024-01-02')
+
+    assert filtered['description'].tolist() == ['b', 'c']